@@ -0,0 +1,137 @@
+"""
+Benchmarks of pyMannKendall for airspeed velocity (asv), every public function and the core private functions
+are timed over a grid of data length, tie fraction, missing value fraction and No. of columns.
+Run all benchmarks with "asv run" from the repo root and compare two commits with "asv continuous master HEAD".
+Scaling exponents of the same functions are checked against stored baselines by benchmarks/scaling.py.
+"""
+
+from __future__ import division
+import numpy as np
+import pymannkendall as mk
+from pymannkendall.synthetic import generate_workload
+
+_mk = mk.pymannkendall
+
+
+# Benchmark data
+def make_data(n, ties = 0., nans = 0., columns = 1, seed = 0):
+    # a weak trend, where a fraction of values is rounded to make ties and a fraction is missing
+    rng = np.random.RandomState(seed)
+    x = rng.rand(n, columns) + 1e-4 * np.arange(n)[:, None]
+    
+    tied = rng.rand(n, columns) < ties
+    x[tied] = np.round(x[tied], 1)
+    x[rng.rand(n, columns) < nans] = np.nan
+    
+    if columns == 1:
+        return x[:, 0]
+    
+    return x
+
+
+def _private(name):
+    return getattr(_mk, name)
+
+
+def _expanding(x):
+    # update of an existing history by 100 new values
+    result, state = mk.expanding_test(x[:-100])
+    return lambda x: mk.expanding_test(x[-100:], state)
+
+
+def _clean(f):
+    # private functions do not skip missing values
+    return lambda x: f(x[~np.isnan(x)])
+
+
+# name: (function of the data, largest n, No. of columns of the data)
+# largest n keeps quadratic functions (in time or memory) within a few seconds.
+CASES = {
+    'original_test': (mk.original_test, 10**4, 1),
+    'hamed_rao_modification_test': (mk.hamed_rao_modification_test, 10**4, 1),
+    'yue_wang_modification_test': (mk.yue_wang_modification_test, 10**4, 1),
+    'pre_whitening_modification_test': (mk.pre_whitening_modification_test, 10**4, 1),
+    'trend_free_pre_whitening_modification_test': (mk.trend_free_pre_whitening_modification_test, 10**4, 1),
+    'seasonal_test': (mk.seasonal_test, 10**5, 1),
+    'correlated_seasonal_test': (mk.correlated_seasonal_test, 10**4, 1),
+    'sequential_test': (mk.sequential_test, 10**6, 1),
+    'trend_matrix': (mk.trend_matrix, 2000, 1),
+    'expanding_test': (_expanding, 10**6, 1),
+    'pettitt_test': (mk.pettitt_test, 10**6, 1),
+    'sens_slope': (mk.sens_slope, 10**4, 1),
+    'sens_slope_approximate': (lambda x: mk.sens_slope(x, method = 'approximate', seed = 0), 10**6, 1),
+    'seasonal_sens_slope': (mk.seasonal_sens_slope, 10**5, 1),
+    'multivariate_test': (mk.multivariate_test, 10**4, 5),
+    'regional_test': (mk.regional_test, 10**4, 5),
+    'regional_sens_slope': (mk.regional_sens_slope, 10**5, 5),
+    'regional_seasonal_test': (lambda x: mk.regional_seasonal_test(x[:len(x) // 12 * 12].reshape(-1, 12, x.shape[1])), 10**4, 5),
+    'homogeneity_test': (mk.homogeneity_test, 10**4, 5),
+    'correlated_multivariate_test': (mk.correlated_multivariate_test, 10**4, 5),
+    'partial_test': (mk.partial_test, 10**4, 2),
+    'fdr_test': (lambda x: mk.fdr_test(x), 10**6, 1),
+    'walker_test': (lambda x: mk.walker_test(x), 10**6, 1),
+    '__mk_score': (_clean(lambda x: _private('__mk_score')(x, len(x))), 10**4, 1),
+    '__sens_estimator': (_clean(_private('__sens_estimator')), 10**4, 1),
+    '__acf': (_clean(lambda x: _private('__acf')(x, len(x) - 1)), 10**5, 1),
+    '__R': (_clean(_private('__R')), 10**6, 1),
+    '__K': (_clean(lambda x: _private('__K')(x, np.arange(len(x)))), 10**6, 1),
+}
+
+# functions built from the data in setup, so it is not timed
+BUILT = ['expanding_test']
+
+
+class TimeFunctions:
+    params = [sorted(CASES), [10**2, 10**3, 10**4, 10**5, 10**6], [0., 0.5], [0., 0.1]]
+    param_names = ['function', 'n', 'ties', 'nans']
+    timeout = 300
+    
+    def setup(self, function, n, ties, nans):
+        f, max_n, columns = CASES[function]
+        
+        # skipped by asv
+        if n > max_n:
+            raise NotImplementedError()
+        
+        self.x = make_data(n, ties, nans, columns)
+        self.f = f(self.x) if function in BUILT else f
+    
+    def time_function(self, function, n, ties, nans):
+        self.f(self.x)
+
+
+class TimeColumns:
+    params = [['multivariate_test', 'regional_test', 'regional_sens_slope', 'homogeneity_test', 'correlated_multivariate_test', 'partial_test'], [2, 10, 100]]
+    param_names = ['function', 'columns']
+    timeout = 300
+    
+    def setup(self, function, columns):
+        self.f = CASES[function][0]
+        self.x = make_data(1000, 0.1, 0.01, columns)
+    
+    def time_function(self, function, columns):
+        self.f(self.x)
+
+
+class TimeWorkloads:
+    # realistic data at scale, see pymannkendall.synthetic
+    params = [['hamed_rao', 'seasonal', 'correlated_multivariate', 'censored']]
+    param_names = ['workload']
+    timeout = 600
+    tests = {
+        'hamed_rao': mk.hamed_rao_modification_test,
+        'seasonal': lambda x: mk.seasonal_test(x, period = 365),
+        'correlated_multivariate': mk.correlated_multivariate_test,
+        'censored': mk.regional_test,
+    }
+    
+    def setup(self, workload):
+        self.x = generate_workload(workload, seed = 0)
+    
+    def time_workload(self, workload):
+        self.tests[workload](self.x)
+
+
+class TimeImport:
+    def timeraw_import(self):
+        return "import pymannkendall"
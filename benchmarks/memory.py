@@ -0,0 +1,94 @@
+"""
+Peak memory of every benchmarked function, recorded by tracemalloc (numpy arrays are also tracked).
+Every function is measured at n/10 and n (n is its largest benchmark size, n/100 and n/10 for quadratic functions).
+The bytes per input element are reported and the memory exponent log(peak(n) / peak(n/10)) / log(10) is checked against
+the complexity class configured in benchmarks/memory.json, e.g. a function which is expected to be linear fails if its
+memory grows quadratically. With asv, the bytes per input element are tracked by MemoryFunctions.
+Usage:
+    python benchmarks/memory.py                          # check, exit code 1 if a function exceeds its class
+    python benchmarks/memory.py sens_slope seasonal_test  # check some functions only
+"""
+
+from __future__ import division, print_function
+import os
+import sys
+import json
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.benchmarks import CASES, BUILT, make_data
+
+CLASSES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'memory.json')
+
+# largest memory exponent allowed for every complexity class
+EXPONENTS = {'constant': 0.2, 'linear': 1.2, 'quadratic': 2.2}
+
+
+def peak_memory(name, n):
+    f, max_n, columns = CASES[name]
+    x = make_data(n, 0.5, 0.1, columns)
+    
+    if name in BUILT:
+        f = f(x)
+    
+    # first call imports scipy, which is not counted
+    f(x[:100])
+    
+    # only the allocations of the function call are counted, not the data
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    f(x)
+    peak = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    
+    return peak, x.size
+
+
+class MemoryFunctions:
+    # asv benchmark of the same peak memory, as bytes per input element
+    params = [sorted(CASES), [10**3, 10**4, 10**5, 10**6]]
+    param_names = ['function', 'n']
+    unit = 'bytes/element'
+    
+    def setup(self, function, n):
+        if n > CASES[function][1]:
+            raise NotImplementedError()
+    
+    def track_bytes_per_element(self, function, n):
+        peak, size = peak_memory(function, n)
+        return peak / size
+
+
+def main(args):
+    names = args or sorted(CASES)
+    
+    with open(CLASSES) as f:
+        classes = json.load(f)
+    
+    failed = []
+    print('%-45s %12s %12s %9s   %s' % ('function', 'peak (B)', 'B/element', 'exponent', 'class'))
+    
+    for name in names:
+        max_n = CASES[name][1]
+        cls = classes.get(name)
+        
+        if cls == 'quadratic':
+            max_n = max_n // 10
+        
+        small, small_size = peak_memory(name, max_n // 10)
+        peak, size = peak_memory(name, max_n)
+        e = np.log10(max(peak, 1) / max(small, 1)) / np.log10(size / small_size)
+        
+        status = '' if cls is None else ('ok' if e <= EXPONENTS[cls] else 'EXCEEDED')
+        print('%-45s %12d %12.1f %9.2f   %s %s' % (name, peak, peak / size, e, cls, status))
+        
+        if status == 'EXCEEDED':
+            failed.append(name)
+    
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
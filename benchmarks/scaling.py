@@ -0,0 +1,84 @@
+"""
+Check the time complexity of every benchmarked function against stored baselines.
+Every function is timed at n/10 and n (n is its largest benchmark size) and the scaling exponent
+log(t(n) / t(n/10)) / log(10) is compared with benchmarks/baselines.json, so an algorithmic regression
+(e.g. O(n log n) becoming O(n^2)) fails on any machine, where absolute timings can not be compared.
+Usage:
+    python benchmarks/scaling.py            # check, exit code 1 on a regression
+    python benchmarks/scaling.py --update   # store the measured exponents as new baselines
+    python benchmarks/scaling.py original_test sens_slope  # check some functions only
+"""
+
+from __future__ import division, print_function
+import os
+import sys
+import json
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.benchmarks import CASES, BUILT, make_data
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+TOLERANCE = 0.3
+
+
+def best_time(name, n, min_time = 0.2):
+    f, max_n, columns = CASES[name]
+    x = make_data(n, 0.5, 0.1, columns)
+    
+    if name in BUILT:
+        f = f(x)
+    
+    # best of repeated runs, at least 3 runs and min_time in total
+    times = []
+    while len(times) < 3 or sum(times) < min_time:
+        start = time.perf_counter()
+        f(x)
+        times.append(time.perf_counter() - start)
+    
+    return min(times)
+
+
+def exponent(name):
+    max_n = CASES[name][1]
+    
+    return np.log10(best_time(name, max_n) / best_time(name, max_n // 10))
+
+
+def main(args):
+    update = '--update' in args
+    names = [a for a in args if a != '--update'] or sorted(CASES)
+    
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+    
+    failed = []
+    for name in names:
+        e = exponent(name)
+        base = baselines.get(name)
+        
+        if update:
+            baselines[name] = round(e, 2)
+            print('%-45s %5.2f' % (name, e))
+        elif base is None:
+            print('%-45s %5.2f   no baseline' % (name, e))
+        else:
+            status = 'ok' if e <= base + TOLERANCE else 'REGRESSION'
+            print('%-45s %5.2f   baseline %5.2f   %s' % (name, e, base, status))
+            
+            if status != 'ok':
+                failed.append(name)
+    
+    if update:
+        with open(BASELINES, 'w') as f:
+            json.dump(baselines, f, indent=4, sort_keys=True)
+            f.write('\n')
+    
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
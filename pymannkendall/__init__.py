@@ -1,7 +1,22 @@
-from .pymannkendall import sens_slope, seasonal_sens_slope, original_test, hamed_rao_modification_test, yue_wang_modification_test, pre_whitening_modification_test, trend_free_pre_whitening_modification_test, multivariate_test, seasonal_test, regional_test, correlated_multivariate_test, correlated_seasonal_test, partial_test
+import sys
+from .pymannkendall import sens_slope, seasonal_sens_slope, regional_sens_slope, original_test, hamed_rao_modification_test, yue_wang_modification_test, pre_whitening_modification_test, trend_free_pre_whitening_modification_test, multivariate_test, seasonal_test, regional_test, regional_seasonal_test, homogeneity_test, correlated_multivariate_test, correlated_seasonal_test, partial_test, sequential_test, trend_matrix, expanding_test
+from .field_significance import fdr_test, walker_test
+from .pettitt import pettitt_test
+from .batch import batch_test
 
-__all__ = [sens_slope, seasonal_sens_slope, original_test, hamed_rao_modification_test, yue_wang_modification_test, pre_whitening_modification_test, trend_free_pre_whitening_modification_test, multivariate_test, seasonal_test, regional_test, correlated_multivariate_test, correlated_seasonal_test, partial_test]
+__all__ = [sens_slope, seasonal_sens_slope, regional_sens_slope, original_test, hamed_rao_modification_test, yue_wang_modification_test, pre_whitening_modification_test, trend_free_pre_whitening_modification_test, multivariate_test, seasonal_test, regional_test, regional_seasonal_test, homogeneity_test, correlated_multivariate_test, correlated_seasonal_test, partial_test, sequential_test, trend_matrix, expanding_test, fdr_test, walker_test, pettitt_test, batch_test]
 
-from ._version import get_versions
-__version__ = get_versions()['version']
-del get_versions
\ No newline at end of file
+# version is resolved on first access, as it may run git in a source checkout. Module __getattr__ (PEP 562)
+# needs Python 3.7, so older interpreters resolve it on import.
+if sys.version_info < (3, 7):
+    from ._version import get_versions
+    __version__ = get_versions()['version']
+    del get_versions
+
+def __getattr__(name):
+    if name == '__version__':
+        from ._version import get_versions
+        globals()['__version__'] = get_versions()['version']
+        return globals()['__version__']
+    
+    raise AttributeError("module 'pymannkendall' has no attribute " + repr(name))
@@ -0,0 +1,99 @@
+"""
+Batch run of a trend test over many series (e.g. cells of a land/ocean grid), where empty (all-NaN or a single value) and constant
+series are short-circuited and duplicate series are computed only once.
+Approach: Empty and constant series are found for all columns at once. A constant series has S = 0 and var_s = 0 of any length,
+so its result is the result of one constant series with its own intercept. Other series are hashed by their bytes.
+"""
+
+from __future__ import division
+import hashlib
+import numpy as np
+from collections import namedtuple
+from .pymannkendall import __preprocessing, original_test
+
+
+# 'no trend' result of an empty series from the result of a constant series, where Tau, slope and intercept are unknown
+def __empty_result(constant):
+    fields = [k for k in ('Tau', 'slope', 'intercept') if k in constant._fields]
+    
+    return constant._replace(**dict((k, np.nan) for k in fields))
+
+
+# equality of two series, where missing values are equal (array_equal has no equal_nan before numpy 1.19)
+def __same_values(a, b):
+    missing = np.isnan(a)
+    
+    return np.array_equal(missing, np.isnan(b)) and np.array_equal(a[~missing], b[~missing])
+
+
+def batch_test(x_old, test = None, **kwargs):
+    """
+    This function runs a trend test on every column (series) of a matrix. Empty series (less than two values) get the 'no trend' result without calculation, constant series get the result of one constant series and series which are exact duplicates of another one are calculated only once.
+    Input:
+        x: a matrix of data, where every column is a series (e.g. a grid cell)
+        test: a test of a single series with slope and intercept, e.g. mk.hamed_rao_modification_test or mk.sens_slope (default None, mk.original_test)
+        kwargs: any input of the test, e.g. alpha or period
+    Output:
+        results: list of the test result of every series
+        empty: No. of empty series (less than two values), which are skipped
+        constant: No. of constant series (at least two values, all the same), which are skipped
+        duplicate: No. of series which are the same as a series before them, which are skipped
+    Examples
+    --------
+      >>> import numpy as np
+	  >>> import pymannkendall as mk
+      >>> x = np.random.rand(120, 1000).round(1)
+      >>> x[:, :200] = np.nan  # here consider 200 cells without data
+      >>> x[:, 200:400] = 0  # and 200 cells with constant data
+      >>> results, empty, constant, duplicate = mk.batch_test(x, mk.hamed_rao_modification_test, alpha=0.05)
+    """
+    res = namedtuple('Batch_Test', ['results', 'empty', 'constant', 'duplicate'])
+    
+    # the test is looked up on every call, so it is also timed by the profiler
+    if test is None:
+        test = original_test
+    
+    x, c = __preprocessing(x_old)
+    x = x.reshape(len(x), c)
+    
+    # empty and constant series of all columns at once, fmin and fmax skip missing values
+    m = np.count_nonzero(~np.isnan(x), axis=0)
+    lo = np.fmin.reduce(x, axis=0)
+    hi = np.fmax.reduce(x, axis=0)
+    
+    # a series of a single value has no pair, so it has no trend like an empty series
+    empty = m < 2
+    constant = (m >= 2) & (lo == hi)
+    
+    results = [None] * c
+    seen = {}
+    duplicate = 0
+    
+    if (empty | constant).any():
+        template = test(np.zeros(len(x)), **kwargs)
+        
+        if 'intercept' not in template._fields:
+            raise ValueError('batch_test requires a test with slope and intercept, ' + getattr(test, '__name__', repr(test)) + ' has only ' + ', '.join(template._fields) + '.')
+        
+        no_trend = __empty_result(template)
+        
+        for i in np.flatnonzero(empty):
+            results[i] = no_trend
+        
+        for i in np.flatnonzero(constant):
+            results[i] = template._replace(intercept = np.float64(lo[i]))
+    
+    # other series are hashed by their bytes, a duplicate is also checked value by value
+    for i in np.flatnonzero(~(empty | constant)):
+        key = hashlib.sha1(np.ascontiguousarray(x[:,i]).tobytes()).hexdigest()
+        j = seen.get(key)
+        
+        if j is not None and __same_values(x[:,i], x[:,j]):
+            results[i] = results[j]
+            duplicate = duplicate + 1
+            continue
+        
+        seen[key] = i
+        results[i] = test(x[:,i], **kwargs)
+    
+    return res(results, int(empty.sum()), int(constant.sum()), duplicate)
@@ -0,0 +1,106 @@
+"""
+Field significance of many (e.g. grid-cell or station) trend tests.
+Approach: Vectorisation, p-values can be a numpy array, memory-mapped array or any array like data of any shape.
+"""
+
+from __future__ import division
+import numpy as np
+from collections import namedtuple
+
+
+# Flat view of all p-values and number of tests, NaN p-values (e.g. empty cells) are not tests
+def __p_values(p):
+    p = np.asarray(p, dtype=float)
+    m = p.size - np.count_nonzero(np.isnan(p))
+    
+    return p, m
+
+
+# Benjamini and Hochberg threshold of sorted p-values, the largest p(k) <= k * alpha / m (0 if there is none)
+def __fdr_threshold(p_sorted, m, alpha):
+    k = np.flatnonzero(p_sorted <= np.arange(1, m+1) * alpha / m)
+    
+    if len(k) == 0:
+        return 0., 0
+    
+    return p_sorted[k[-1]], k[-1] + 1
+
+
+def fdr_test(p, alpha = 0.05):
+    """
+    This function controls the false discovery rate of many local trend tests by the Benjamini and Hochberg (1995) procedure, which is also used for the field significance of trends (Wilks 2006). Only the sorted copy of the p-values is held in memory, so it is O(m log m) for m tests.
+    Input:
+        p: p-values of all local tests (numpy array, memory-mapped array or list of any shape). NaN values are not considered as tests.
+        alpha: false discovery rate (0.05 default), or a sequence of rates to get the result for every rate
+    Output:
+        field_h: True (if at least one local test is significant, i.e. field is significant) or False
+        h: array of the same shape as p, True where the local trend is significant after FDR control
+        p_threshold: largest significant p-value (0 if there is none)
+        n_significant: number of significant local tests
+    For a sequence of alpha, field_h, p_threshold and n_significant are arrays with a value for every rate and h has a last axis with a value for every rate.
+    Examples
+    --------
+      >>> import numpy as np
+	  >>> import pymannkendall as mk
+      >>> p = np.random.rand(1000000)
+      >>> field_h,h,p_threshold,n_significant = mk.fdr_test(p, 0.05)
+    """
+    res = namedtuple('False_Discovery_Rate_Test', ['field_h', 'h', 'p_threshold', 'n_significant'])
+    p, m = __p_values(p)
+    
+    p_sorted = np.sort(p, axis=None)[:m]   # NaN are sorted to the end
+    
+    # a sequence of alpha reuses the sorted p-values, h gets a last axis with one element for every alpha
+    if np.ndim(alpha) > 0:
+        p_threshold, n_significant = np.array([__fdr_threshold(p_sorted, m, a) for a in np.ravel(alpha)]).reshape(-1, 2).T
+        n_significant = n_significant.astype(int)
+        h = (p[..., None] <= p_threshold) & (n_significant > 0)
+        
+        return res(n_significant > 0, h, p_threshold, n_significant)
+    
+    p_threshold, n_significant = __fdr_threshold(p_sorted, m, alpha)
+    
+    if n_significant == 0:
+        h = np.zeros(p.shape, dtype=bool)
+    else:
+        h = p <= p_threshold
+    
+    return res(n_significant > 0, h, p_threshold, n_significant)
+
+
+def walker_test(p, alpha = 0.05):
+    """
+    This function checks the field significance of many local trend tests by the Walker test (Wilks 2006), where the field is significant if the smallest local p-value is below 1 - (1 - alpha)^(1/m). It only needs one pass over the p-values.
+    Input:
+        p: p-values of all local tests (numpy array, memory-mapped array or list of any shape). NaN values are not considered as tests.
+        alpha: global significance level (0.05 default), or a sequence of levels to get the result for every level
+    Output:
+        field_h: True (if the field is significant) or False
+        p: global p-value, 1 - (1 - p_min)^m
+        p_min: smallest local p-value
+        p_threshold: Walker critical value of the local p-value
+    For a sequence of alpha, field_h and p_threshold are arrays with a value for every level.
+    Examples
+    --------
+      >>> import numpy as np
+	  >>> import pymannkendall as mk
+      >>> p = np.random.rand(1000000)
+      >>> field_h,p_global,p_min,p_threshold = mk.walker_test(p, 0.05)
+    """
+    res = namedtuple('Walker_Test', ['field_h', 'p', 'p_min', 'p_threshold'])
+    p, m = __p_values(p)
+    
+    if m == 0:
+        if np.ndim(alpha) > 0:
+            return res(np.zeros(np.size(alpha), dtype=bool), np.nan, np.nan, np.full(np.size(alpha), np.nan))
+        
+        return res(False, np.nan, np.nan, np.nan)
+    
+    p_min = np.nanmin(p)
+    
+    # 1 - (1 - x)^m without loss of precision for large m, for every alpha of a sequence
+    alpha = np.ravel(alpha) if np.ndim(alpha) > 0 else alpha
+    p_threshold = -np.expm1(np.log1p(-alpha) / m)
+    p_global = -np.expm1(m * np.log1p(-p_min))
+    
+    return res(p_min <= p_threshold, p_global, p_min, p_threshold)
@@ -0,0 +1,90 @@
+"""
+Pettitt (1979) change point test, which shares the rank approach of the Mann-Kendall tests.
+Approach: Vectorisation, U statistic of every time step from one ranking, so it is O(n log n). A matrix of data is tested column by column at once.
+"""
+
+from __future__ import division
+import numpy as np
+from collections import namedtuple
+from .pymannkendall import __preprocessing, __R
+
+
+# U(t) of every split point t = 1, ..., n-1 of every column from the ranks, U(t) = 2 * sum(r[:t]) - t(n+1)
+def __pettitt_u(x):
+    n = x.shape[0]
+    t = np.arange(1, n).reshape((-1,) + (1,) * (x.ndim - 1))
+    
+    return 2 * np.cumsum(__R(x, axis=0), axis=0)[:-1] - t * (n + 1)
+
+
+# change point, K and approximated p-value of U series (Pettitt 1979)
+def __pettitt_k(U, n):
+    loc = np.argmax(np.abs(U), axis=0)
+    K = np.max(np.abs(U), axis=0)
+    p = np.minimum(2 * np.exp(-6 * K**2 / (n**3 + n**2)), 1)
+    
+    return loc + 1, K, p
+
+
+def pettitt_test(x_old, alpha = 0.05):
+    """
+    This function checks the Pettitt (1979) change point test, which is a rank based test for a shift in the median of the series. U statistic of every time step is calculated from the ranks, so it takes O(n log n) time.
+    Input:
+        x: a vector (list, numpy array or pandas series) data, or a matrix of data to test every column (series) at once. Missing values are skipped.
+        alpha: significance level (0.05 default), or a sequence of levels to get h for every level
+    Output:
+        h: True (if a change point is present) or False (if a change point is absence)
+        cp: index (in the original data) of the first value after the change point
+        p: p-value of the significance test
+        K: Pettitt's statistic, max |U(t)|
+        U: U(t) of every split point, where U[i] is the split just after value i (NaN for missing values)
+    For a matrix of data, h, cp, p and K are arrays with a value for every column and U is (n-1, column) shaped. For a sequence of alpha, h has a last axis with a value for every level.
+    Examples
+    --------
+      >>> import numpy as np
+	  >>> import pymannkendall as mk
+      >>> x = np.random.rand(1000)
+      >>> h,cp,p,K,U = mk.pettitt_test(x,0.05)
+      >>> x = np.random.rand(1000,50)  # here consider 50 series where every series have 1000 data
+      >>> h,cp,p,K,U = mk.pettitt_test(x,0.05)
+    """
+    res = namedtuple('Pettitt_Test', ['h', 'cp', 'p', 'K', 'U'])
+    x, c = __preprocessing(x_old)
+    x = x.reshape(len(x), c)
+    
+    # series with missing values have their own length, all others are ranked at once
+    n = x.shape[0]
+    U = np.full((max(n - 1, 0), c), np.nan)
+    cp = np.zeros(c, dtype=int)
+    K = np.zeros(c)
+    p = np.ones(c)
+    
+    missing = np.isnan(x).any(axis=0)
+    full = np.flatnonzero(~missing)
+    
+    # a series of less than two values has no split point, so it keeps the no change result
+    if len(full) and n >= 2:
+        U[:,full] = __pettitt_u(x[:,full])
+        cp[full], K[full], p[full] = __pettitt_k(U[:,full], n)
+    
+    for i in np.flatnonzero(missing):
+        valid = np.flatnonzero(~np.isnan(x[:,i]))
+        
+        if len(valid) < 2:
+            continue
+        
+        u = __pettitt_u(x[valid,i])
+        U[valid[:-1],i] = u
+        loc, K[i], p[i] = __pettitt_k(u, len(valid))
+        cp[i] = valid[loc]
+    
+    # a sequence of alpha gives h a last axis with one element for every alpha
+    if np.ndim(alpha) > 0:
+        h = p[..., None] < np.asarray(alpha)
+    else:
+        h = p < alpha
+    
+    if c == 1:
+        return res(h[0], cp[0], p[0], K[0], U[:,0])
+    
+    return res(h, cp, p, K, U)
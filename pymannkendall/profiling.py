@@ -0,0 +1,115 @@
+"""
+Opt-in profiling of the trend tests: wall time, No. of calls and array sizes of every stage (e.g. __preprocessing,
+__missing_values_analysis, __mk_score, __variance_s, __acf, __sens_slope) of every test.
+Approach: Inside the profile context, the functions of the package are replaced by timed wrappers and restored on exit,
+so there is no overhead at all when profiling is not used.
+"""
+
+from __future__ import division
+import sys
+import json
+import time
+import types
+import numpy as np
+from contextlib import contextmanager
+
+__modules = ['pymannkendall.pymannkendall', 'pymannkendall.pettitt', 'pymannkendall.field_significance', 'pymannkendall.batch', 'pymannkendall']
+
+
+# add a call to the stats of a stage
+def __record(stats, name, t, elements):
+    stage = stats.setdefault(name, {'calls': 0, 'time': 0., 'elements': 0})
+    stage['calls'] += 1
+    stage['time'] += t
+    stage['elements'] += elements
+    
+    return stage
+
+
+# timed wrapper of a stage, time is inclusive of the stages called by it.
+# Every stage called inside a test (the outermost profiled call) is also recorded in the stages of that test.
+def __timed(name, f, stats, stack):
+    def wrapper(*args, **kwargs):
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            t = time.perf_counter() - start
+            stack.pop()
+            elements = sum(np.size(a) for a in args if isinstance(a, np.ndarray))
+            __record(stats, name, t, elements)
+            
+            if stack:
+                test = stats.setdefault(stack[0], {'calls': 0, 'time': 0., 'elements': 0})
+                __record(test.setdefault('stages', {}), name, t, elements)
+    
+    wrapper.__wrapped__ = f
+    return wrapper
+
+
+@contextmanager
+def profile(stages = None):
+    """
+    This context manager records wall time (seconds), No. of calls and No. of array elements given to every stage of the package functions called inside it.
+    Input:
+        stages: names of the functions to profile (default None, all functions of the package)
+    Output:
+        stats: dictionary of {stage: {'calls': ..., 'time': ..., 'elements': ...}}, which is filled by the calls inside the context and can be exported by to_json.
+               A test (outermost call) also has 'stages', the same stats of every stage called inside it.
+    Examples
+    --------
+      >>> import numpy as np
+	  >>> import pymannkendall as mk
+      >>> from pymannkendall.profiling import profile, to_json
+      >>> with profile() as stats:
+      ...     result = mk.hamed_rao_modification_test(np.random.rand(1000))
+      >>> stats['__mk_score']['time']
+      >>> stats['hamed_rao_modification_test']['stages']['__acf']['calls']
+      >>> to_json(stats, 'profile.json')
+    """
+    stats = {}
+    stack = []
+    modules = [sys.modules[m] for m in __modules if m in sys.modules]
+    
+    # functions are patched in every module they are defined or imported
+    if stages is None:
+        stages = [k for m in modules for k, v in m.__dict__.items() if isinstance(v, types.FunctionType) and v.__module__ == m.__name__ != 'pymannkendall']
+    
+    targets = {}
+    for m in modules:
+        for k, v in m.__dict__.items():
+            if k in stages and isinstance(v, types.FunctionType):
+                targets.setdefault(v, __timed(k, v, stats, stack))
+    
+    patched = []
+    for m in modules:
+        for k, v in list(m.__dict__.items()):
+            if isinstance(v, types.FunctionType) and v in targets:
+                patched.append((m, k, v))
+                setattr(m, k, targets[v])
+    
+    try:
+        yield stats
+    finally:
+        for m, k, v in patched:
+            setattr(m, k, v)
+
+
+def to_json(stats, filename = None):
+    """
+    This function exports the profile stats as JSON, where stages are sorted by time.
+    Input:
+        stats: stats of the profile context
+        filename: if given, JSON is written to this file (default None)
+    Output:
+        JSON string
+    """
+    stages = sorted(stats, key = lambda k: -stats[k]['time'])
+    text = json.dumps(dict((k, stats[k]) for k in stages), indent = 4)
+    
+    if filename is not None:
+        with open(filename, 'w') as f:
+            f.write(text)
+    
+    return text
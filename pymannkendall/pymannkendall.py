@@ -8,15 +8,67 @@ Citation: Hussain et al., (2019). pyMannKendall: a python package for non parame
 """
 
 from __future__ import division
+import os
+import json
+import time
 import numpy as np
-from scipy.stats import norm, rankdata
 from collections import namedtuple
 
 
 # Supporting Functions
+# Algorithm dispatch: the fastest algorithm of a calculation depends on the data length. The crossover lengths
+# are calibrated on the target machine by "python -m pymannkendall.tune", which stores them in a local JSON file
+# (PYMANNKENDALL_CONFIG or ~/.pymannkendall.json). The file is read on first use.
+__default_thresholds = {'mk_score': 250, 'acf': 300, 'slope_selection': 2**16}
+__thresholds = {}
+
+# short series compare all pairs at once (upper triangle indices) instead of one row per loop, up to this No. of pairs
+__max_pairs = 2**16
+
+def __config_file():
+    return os.environ.get('PYMANNKENDALL_CONFIG', os.path.join(os.path.expanduser('~'), '.pymannkendall.json'))
+
+
+def __threshold(name):
+    if not __thresholds:
+        __thresholds.update(__default_thresholds)
+        
+        if os.path.exists(__config_file()):
+            with open(__config_file()) as f:
+                __thresholds.update(json.load(f).get('thresholds', {}))
+    
+    return __thresholds[name]
+
+
+# scipy is a heavy import, so its functions are imported on the first call instead of with the package
+def __ndtr(x):
+    from scipy.special import ndtr
+    return ndtr(x)
+
+
+def __norm_ppf(q):
+    from scipy.stats import norm
+    return norm.ppf(q)
+
+
+def __chi2_sf(x, df):
+    from scipy.stats import chi2
+    return chi2.sf(x, df)
+
 # Data Preprocessing
+# Buffer protocol, memmap and numpy-backed pandas data are used as views, without a copy
 def __preprocessing(x):
-    x = np.asarray(x).astype(float)
+    data = x
+    x = np.asarray(data)
+    
+    # pandas nullable and Arrow-backed data give an object array of pd.NA, which are given as NaN
+    if x.dtype == object and hasattr(data, 'to_numpy'):
+        x = data.to_numpy(dtype=float, na_value=np.nan)
+    
+    # float32 data (e.g. satellite products) are kept as float32, all other data are float64, without a copy of float64 data
+    if x.dtype != np.float32:
+        x = np.asarray(x, dtype=float)
+    
     dim = x.ndim
     
     if dim == 1:
@@ -27,7 +79,7 @@ def __preprocessing(x):
         
         if c == 1:
             dim = 1
-            x = x.flatten()
+            x = x.ravel()
          
     else:
         print('Please check your dataset.')
@@ -35,27 +87,148 @@ def __preprocessing(x):
     return x, c
 
 	
-# Missing Values Analysis
+# Missing Values Analysis, data without missing values are not copied
 def __missing_values_analysis(x, method = 'skip'):
     if method.lower() == 'skip':
         if x.ndim == 1:
-            x = x[~np.isnan(x)]
+            mask = ~np.isnan(x)
             
         else:
-            x = x[~np.isnan(x).any(axis=1)]
+            mask = ~np.isnan(x).any(axis=1)
+        
+        if not mask.all():
+            x = x[mask]
     
     n = len(x)
     
     return x, n
 
+
+# valid values of a vector and their time (index in the data) from one NaN mask, data without missing values are not copied
+# and their time is None (0, ..., n-1)
+def __valid_values(x):
+    mask = ~np.isnan(x)
+    
+    if mask.all():
+        return x, None
+    
+    t = np.flatnonzero(mask)
+    
+    return x[t], t
+
+
+# data of a vector test. With assume_clean, data are trusted to be a float vector without missing values,
+# so they are used as they are, without the dimension check and NaN scanning (for short series in tight loops).
+def __vector_data(x_old, assume_clean = False):
+    if assume_clean:
+        return np.asarray(x_old), None
+    
+    x, c = __preprocessing(x_old)
+    
+    return __valid_values(x)
+
 	
-# ACF Calculation
+# Season Labels from datetime values
+def __datetime_seasons(t, period):
+    years = t.astype('datetime64[Y]').astype(np.int64)
+    
+    if period == 12:
+        labels = t.astype('datetime64[M]').astype(np.int64) % 12
+    elif period == 4:
+        labels = (t.astype('datetime64[M]').astype(np.int64) % 12) // 3
+    elif period == 52:
+        # ISO weeks, where the year is the year of the Thursday of the week, so every week of a weekly series has its
+        # own (cycle, season). Week 53 of long ISO years is its own season (label 52).
+        days = t.astype('datetime64[D]').astype(np.int64)
+        thursday = (days - (days + 3) % 7 + 3).astype('datetime64[D]')
+        years = thursday.astype('datetime64[Y]').astype(np.int64)
+        labels = (thursday - thursday.astype('datetime64[Y]')).astype(np.int64) // 7
+    else:
+        raise ValueError('Datetime seasons are supported for period 4, 12 or 52. Here period is ' + str(period) + '.')
+    
+    # cycle (year) of each observation, counted from the first year
+    cycles = years - years.min()
+    
+    return labels, cycles
+
+
+# Split data into seasonal groups without padding, with the season (position in the cycle) of every group
+def __seasonal_groups(x, period = 12, seasons = None):
+    if seasons is None:
+        if x.ndim == 1:
+            # strided views, one per season
+            groups = [x[i::period] for i in range(period)]
+        else:
+            groups = [x[:,i] for i in range(x.shape[1])]
+            
+        cycles = [np.arange(len(g)) for g in groups]
+        
+        return groups, cycles, np.arange(len(groups))
+    
+    seasons = np.asarray(seasons)
+    
+    if x.ndim != 1 or len(seasons) != len(x):
+        raise ValueError('seasons must be a one dimensional array with the same length as x.')
+    
+    if np.issubdtype(seasons.dtype, np.datetime64):
+        labels, t = __datetime_seasons(seasons, period)
+    else:
+        labels, t = seasons, None
+    
+    # group observations by label with a single stable sort, which keeps time order inside a season
+    if t is None:
+        order = np.argsort(labels, kind='stable')
+    else:
+        order = np.lexsort((seasons, labels))
+    
+    labels = labels[order]
+    x = x[order]
+    
+    bounds = np.concatenate(([0], np.flatnonzero(labels[1:] != labels[:-1]) + 1, [len(labels)]))
+    groups = [x[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    
+    if t is None:
+        cycles = [np.arange(b - a) for a, b in zip(bounds[:-1], bounds[1:])]
+    else:
+        t = t[order]
+        cycles = [t[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    
+    # numeric labels are the season itself, so empty seasons keep their place. Other labels are counted in sorted order.
+    labels = labels[bounds[:-1]]
+    
+    if not np.issubdtype(labels.dtype, np.number):
+        labels = np.arange(len(groups))
+    
+    return groups, cycles, labels
+
+
+# autocovariance of a zero mean series by np.correlate, O(n^2)
+def __acov_correlate(y):
+    n = len(y)
+    d = n * np.ones(2 * n - 1)
+    
+    return (np.correlate(y, y, 'full') / d)[n - 1:]
+
+
+# autocovariance of a zero mean series by FFT, O(n log n).
+# Circular autocovariance of the zero padded series is the linear one.
+def __acov_fft(y):
+    n = len(y)
+    f = np.fft.rfft(y, 2 ** int(np.ceil(np.log2(2 * n - 1))))
+    
+    return np.fft.irfft(f * np.conj(f))[:n] / n
+
+
+# ACF Calculation. The lag-1 ACF of the pre-whitening tests always uses np.correlate, as FFT rounding can flip
+# near-tied pre-whitened values and so change S. Long lags (variance corrections) use FFT for long series.
 def __acf(x, nlags):
     y = x - x.mean()
     n = len(x)
-    d = n * np.ones(2 * n - 1)
     
-    acov = (np.correlate(y, y, 'full') / d)[n - 1:]
+    if nlags <= 1 or n < __threshold('acf'):
+        acov = __acov_correlate(y)
+    else:
+        acov = __acov_fft(y)
     
     if acov[0] != 0 :
         return acov[:nlags+1]/acov[0]
@@ -63,15 +236,30 @@ def __acf(x, nlags):
         return acov[:nlags+1]     
 
 
-# vectorization approach to calculate mk score, S
+# Mann-Kendal's score S, long series use the O(n log n) merge sort approach of Knight (1966).
+# Pairs with a missing value are not compared, like the vectorised loop.
 def __mk_score(x, n):
+    if n < __threshold('mk_score'):
+        return __mk_score_loop(x, n)
+    
+    x = x[~np.isnan(x)]
+    
+    return float(__K(x, np.arange(len(x))))
+
+
+# vectorization approach to calculate mk score, S
+def __mk_score_loop(x, n):
+    if n*(n-1)//2 <= __max_pairs:
+        i, j = np.triu_indices(n, 1)
+        return float(np.count_nonzero(x[j] > x[i]) - np.count_nonzero(x[j] < x[i]))
+    
     s = 0
 
-    demo = np.ones(n) 
+    # exact integer count, also for float32 data
     for k in range(n-1):
-        s = s + np.sum(demo[k+1:n][x[k+1:n] > x[k]]) - np.sum(demo[k+1:n][x[k+1:n] < x[k]])
+        s = s + np.count_nonzero(x[k+1:n] > x[k]) - np.count_nonzero(x[k+1:n] < x[k])
         
-    return s
+    return float(s)
 
 	
 # original Mann-Kendal's variance S calculation
@@ -96,102 +284,458 @@ def __variance_s(x, n):
     return var_s
 
 
-# standardized test statistic Z
+# vectorization approach to calculate S of every column (block) at once
+def __block_mk_score(x):
+    (n, c) = x.shape
+    
+    # long columns use the merge sort approach one by one, like __mk_score
+    if n >= __threshold('mk_score'):
+        return np.array([__mk_score(x[:,i], n) for i in range(c)])
+    
+    s = np.zeros(c, dtype=np.int64)
+    
+    # NaN comparisons are always False, so missing values drop out of every column separately
+    for k in range(n-1):
+        s = s + np.count_nonzero(x[k+1:n] > x[k], axis=0) - np.count_nonzero(x[k+1:n] < x[k], axis=0)
+    
+    return s.astype(float)
+
+
+# vectorization approach to calculate S, var(S) and sample size of every column (block) at once
+def __block_scores(x):
+    (n, c) = x.shape
+    s = __block_mk_score(x)
+    m = np.sum(~np.isnan(x), axis=0)
+    
+    # tie groups of every column from one sort, NaN are sorted to the end and never tie
+    xs = np.sort(x, axis=0).T.ravel()
+    col = np.repeat(np.arange(c), n)
+    start = np.flatnonzero(np.concatenate(([True], (xs[1:] != xs[:-1]) | (col[1:] != col[:-1]))))
+    tp = np.diff(np.append(start, len(xs)))
+    ties = np.bincount(col[start], weights=tp*(tp-1)*(2*tp+5), minlength=c)
+    
+    var_s = (m*(m-1)*(2*m+5) - ties)/18
+    
+    return s, var_s, m
+
+
+# standardized test statistic Z, for a scalar or an array of S
 def __z_score(s, var_s):
-    if s > 0:
-        z = (s - 1)/np.sqrt(var_s)
-    elif s == 0:
-        z = 0
-    elif s < 0:
-        z = (s + 1)/np.sqrt(var_s)
+    s = np.asarray(s, dtype=float)
     
-    return z
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(s == 0, 0., (s - np.sign(s))/np.sqrt(var_s))
+    
+    return z[()]
 
 
-# calculate the p_value
-def __p_value(z, alpha):
+# critical value of the two tail test, calculated once for every alpha
+__critical_values = {}
+
+def __critical_value(alpha):
+    if np.ndim(alpha) > 0:
+        return np.array([__critical_value(a) for a in np.ravel(alpha)])
+    
+    if alpha not in __critical_values:
+        __critical_values[alpha] = __norm_ppf(1-alpha/2)
+    
+    return __critical_values[alpha]
+
+
+# trend code -1, 0 and 1 are decreasing, no trend and increasing
+__trend_names = np.array(['decreasing', 'no trend', 'increasing'])
+
+
+# p_value, significance and trend code for a scalar or an array of z.
+# For a sequence of alpha, h and trend get a last axis with one element for every alpha.
+def __significance(z, alpha):
+    z = np.asarray(z, dtype=float)
+    
     # two tail test
-    p = 2*(1-norm.cdf(abs(z)))  
-    h = abs(z) > norm.ppf(1-alpha/2)
+    p = 2*(1-__ndtr(np.abs(z)))
+    
+    if np.ndim(alpha) > 0:
+        z = z[..., None]
+    
+    h = np.abs(z) > __critical_value(alpha)
+    trend = np.where(h, np.sign(z), 0).astype(np.int8)
+    
+    return p, h, trend
 
-    if (z < 0) and h:
-        trend = 'decreasing'
-    elif (z > 0) and h:
-        trend = 'increasing'
-    else:
-        trend = 'no trend'
+
+# calculate the p_value
+def __p_value(z, alpha):
+    p, h, trend = __significance(z, alpha)
+    trend = __trend_names[trend + 1]
+    
+    if p.ndim == 0:
+        if h.ndim == 0:
+            return p[()], h[()], str(trend)
+        else:
+            return p[()], h, tuple(str(t) for t in trend)
     
     return p, h, trend
 
 
-def __R(x):
-    n = len(x)
-    R = []
+# rank of every value (of every column with axis = 0), sum of sign(x[j] - x[i]) is calculated from the average rank
+def __R(x, axis = None):
+    from scipy.stats import rankdata
+    return rankdata(x, axis = axis)
+
+
+# number of tied pairs in a sorted array
+def __tied_pairs(*xs):
+    n = len(xs[0])
+    
+    if n == 0:
+        return 0
     
-    for j in range(n):
-        i = np.arange(n)
-        s = np.sum(np.sign(x[j] - x[i]))
-        R.extend([(n + 1 + s)/2])
+    change = np.zeros(n - 1, dtype=bool)
+    for x in xs:
+        change = change | (x[1:] != x[:-1])
     
-    return np.asarray(R)
+    t = np.diff(np.concatenate(([0], np.flatnonzero(change) + 1, [n])))
+    
+    return int(np.sum(t * (t - 1) // 2))
 
 
+# sum of sign((x[j] - x[i]) * (z[j] - z[i])) by the merge sort approach of Knight (1966)
 def __K(x,z):
     n = len(x)
-    K = 0
+    order = np.lexsort((z, x))
+    xs = x[order]
+    zs = z[order]
     
-    for i in range(n-1):
-        j = np.arange(i,n)
-        K = K + np.sum(np.sign((x[j] - x[i]) * (z[j] - z[i])))
+    # discordant pairs are the inversions of z, when data are sorted by x (and by z within ties of x)
+    r = np.empty(n, dtype=np.int64)
+    r[np.argsort(zs, kind='stable')] = np.arange(n)
+    discordant = __inversions(r)
+    
+    K = n*(n-1)//2 - __tied_pairs(xs) - __tied_pairs(np.sort(zs)) + __tied_pairs(xs, zs) - 2 * discordant
     
     return K
 
+
+# covariance matrix of Mann-Kendall scores of every column (Libiseller and Grimvall (2002)).
+# Ranks of every column are calculated once and reused for all K and R terms.
+def __gamma(x):
+    (n, c) = x.shape
+    R = np.column_stack([__R(x[:,i]) for i in range(c)])
+    RR = np.dot(R.T, R)
+    
+    Gamma = np.ones([c,c])
+    
+    for i in range(c):
+        for j in range(i+1):
+            k = __K(R[:,i], R[:,j])
+            Gamma[i,j] = (k + 4 * RR[i,j] - n*(n+1)**2)/3
+            Gamma[j,i] = Gamma[i,j]
+    
+    return Gamma
+
 	
 # Original Sens Estimator
-def __sens_estimator(x):
+def __sens_estimator(x, t = None):
     idx = 0
     n = len(x)
+    
+    if t is None:
+        t = np.arange(n)
+    
+    if n*(n-1)//2 <= __max_pairs:
+        i, j = np.triu_indices(n, 1)
+        dt = t[j] - t[i]
+        return np.subtract(x[j], x[i], dtype=float) / np.where(dt == 0, np.nan, dt)
+    
     d = np.ones(int(n*(n-1)/2))
 
     for i in range(n-1):
         j = np.arange(i+1,n)
-        d[idx : idx + len(j)] = (x[j] - x[i]) / (j - i)
+        dt = t[j] - t[i]
+        d[idx : idx + len(j)] = np.subtract(x[j], x[i], dtype=float) / np.where(dt == 0, np.nan, dt)
         idx = idx + len(j)
         
     return d
 
 
-def sens_slope(x):
+# Count inversions (pairs i < j with r[i] > r[j]) of an integer permutation by a bottom-up merge sort.
+# Every pass merges the neighbouring sorted blocks with one stable sort, so the full count is O(n log n).
+# With pairs = True the inverted pairs (at most limit of them) are also returned as index arrays.
+# With per_element = True the number of preceding greater elements of every element is returned instead of the total.
+def __inversions(r, pairs = False, limit = None, per_element = False):
+    r = np.asarray(r, dtype=np.int64)
+    n = len(r)
+    pos = np.arange(n)
+    idx = np.arange(n)
+    count = 0
+    counts = np.zeros(n, dtype=np.int64)
+    left_ids = []
+    right_ids = []
+    found = 0
+    width = 1
+    
+    while width < n:
+        block = pos // (2 * width)
+        right = (pos // width) % 2 == 1
+        order = np.argsort(block * n + r, kind='stable')
+        
+        # a right element merged at position m of its block has m - (its rank in the right half) smaller left elements,
+        # and the left elements greater than it are the rest of the sorted left half
+        merged = np.empty(n, dtype=np.int64)
+        merged[order] = pos
+        less = merged[right] - pos[right] + width
+        start = block[right] * 2 * width + less
+        cnt = width - less
+        count = count + int(cnt.sum())
+        
+        if per_element:
+            counts[idx[right]] += cnt
+        
+        if pairs and (limit is None or found < limit):
+            if limit is not None:
+                keep = np.searchsorted(np.cumsum(cnt), limit - found, side='right')
+                start, cnt = start[:keep], cnt[:keep]
+                
+            total = int(cnt.sum())
+            offset = np.arange(total) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+            left_ids.append(idx[np.repeat(start, cnt) + offset])
+            right_ids.append(np.repeat(idx[right][:len(cnt)], cnt))
+            found = found + total
+        
+        r = r[order]
+        idx = idx[order]
+        width = width * 2
+    
+    if pairs:
+        if left_ids:
+            return count, np.concatenate(left_ids), np.concatenate(right_ids)
+        else:
+            return count, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    
+    if per_element:
+        return counts
+    
+    return count
+
+
+# Rank of every observation on the line y = x - theta * t inside its group.
+# Equal y are ordered as already crossed, so the inversions against the theta = -inf order count the slopes <= theta.
+def __line_ranks(x, t, g, theta):
+    n = len(x)
+    order = np.lexsort((-np.arange(n), -t, x - theta * t, g))
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+    
+    return order, rank
+
+
+# k-th smallest (1 based) pairwise slope of several groups by bisection on the slope value.
+# Slopes are never built except for at most budget pairs around the k-th one, so memory is linear in n.
+def __slope_select(x, t, g, k, budget):
+    n = len(x)
+    base = np.lexsort((-np.arange(n), x, t, g))
+    
+    def count_le(theta):
+        return __inversions(__line_ranks(x, t, g, theta)[1][base])
+    
+    # t is integer, so every slope is inside the data range
+    span = np.max(x) - np.min(x)
+    lo, c_lo = -span - 1, 0
+    hi = span
+    c_hi = count_le(hi)
+    
+    while True:
+        # the bracket is widened beyond the rounding of x - theta * t, so the exact slopes decide the order inside it.
+        # Bisection goes on until the widened bracket (which can pull in a tie cluster at its ends) fits in budget.
+        tol = 64 * np.finfo(float).eps * (np.max(np.abs(x)) + max(abs(lo), abs(hi)) * np.max(np.abs(t)))
+        
+        if c_hi - c_lo <= budget:
+            c_wide = count_le(lo - tol)
+            
+            if count_le(hi + tol) - c_wide <= budget:
+                c_lo = c_wide
+                break
+        
+        mid = lo + (hi - lo) / 2
+        
+        # a bracket at the resolution of the rounding only holds slopes tied with the k-th one
+        if mid <= lo or mid >= hi or hi - lo <= tol:
+            c_lo = count_le(lo - tol)
+            break
+        
+        c = count_le(mid)
+        
+        if c >= k:
+            hi, c_hi = mid, c
+        else:
+            lo, c_lo = mid, c
+    
+    order_lo = __line_ranks(x, t, g, lo - tol)[0]
+    rank_hi = __line_ranks(x, t, g, hi + tol)[1]
+    total, i, j = __inversions(rank_hi[order_lo], pairs = True, limit = budget)
+    
+    i, j = order_lo[i], order_lo[j]
+    d = np.sort((x[j] - x[i]) / (t[j] - t[i]))
+    
+    if len(d) == 0:
+        return np.nan
+    
+    # a tie cluster larger than budget holds the k-th slope, its kept slopes are all the same value
+    if total > len(d):
+        return d[len(d) // 2]
+    
+    return d[min(max(k - c_lo - 1, 0), len(d) - 1)]
+
+
+# Median of the pairwise slopes of every group (season or station), where t is the time of each value.
+# NaN values and pairs with the same time are dropped up front and the slope sets are never concatenated.
+def __grouped_slope_median(groups, cycles, budget = None):
+    x, t, g = [], [], []
+    
+    for i in range(len(groups)):
+        mask = ~np.isnan(groups[i])
+        
+        if mask.all():
+            x.append(np.asarray(groups[i], dtype=float))
+            t.append(np.asarray(cycles[i]))
+        else:
+            x.append(np.asarray(groups[i][mask], dtype=float))
+            t.append(np.asarray(cycles[i])[mask])
+        
+        g.append(np.full(len(x[i]), i))
+    
+    x, t, g = np.concatenate(x), np.concatenate(t), np.concatenate(g)
+    n = len(x)
+    
+    if budget is None:
+        budget = max(8 * n, __threshold('slope_selection'))
+    
+    # number of valid pairs, excluding pairs of the same group and time
+    bounds = np.concatenate(([0], np.flatnonzero((g[1:] != g[:-1]) | (t[1:] != t[:-1])) + 1, [n]))
+    ties = np.diff(bounds)
+    group_size = np.bincount(g, minlength=len(groups))
+    N = int(np.sum(group_size * (group_size - 1) // 2) - np.sum(ties * (ties - 1) // 2))
+    
+    if N == 0:
+        return np.nan
+    
+    if N <= budget:
+        d = np.empty(N)
+        idx = 0
+        edge = np.concatenate(([0], np.cumsum(group_size)))
+        
+        for i in range(len(groups)):
+            s = __sens_estimator(x[edge[i]:edge[i+1]], t[edge[i]:edge[i+1]])
+            s = s[~np.isnan(s)]
+            d[idx : idx + len(s)] = s
+            idx = idx + len(s)
+        
+        return np.median(d)
+    
+    if N % 2 == 1:
+        return __slope_select(x, t, g, N // 2 + 1, budget)
+    else:
+        return (__slope_select(x, t, g, N // 2, budget) + __slope_select(x, t, g, N // 2 + 1, budget)) / 2
+
+
+# Median of m randomly sampled pairwise slopes, where m is chosen by the Dvoretzky-Kiefer-Wolfowitz inequality,
+# so the rank of the estimate is within tol of the true median (as a fraction of all slopes) with probability 1 - alpha.
+# lower and upper are the sample quantiles 0.5 -/+ tol, which bound the exact slope with the same probability.
+def __sampled_slope(x, t, tol, alpha, seed):
+    n = len(x)
+    m = int(np.ceil(np.log(2 / alpha) / (2 * tol**2)))
+    
+    rng = np.random.default_rng(seed)
+    i = rng.integers(0, n, size=m)
+    j = (i + 1 + rng.integers(0, n - 1, size=m)) % n
+    d = np.subtract(x[j], x[i], dtype=float) / (t[j] - t[i])
+    
+    lo = int(np.floor((.5 - tol) * m)) - 1
+    hi = int(np.ceil((.5 + tol) * m))
+    d.sort()
+    
+    lower = d[lo] if lo >= 0 else -np.inf
+    upper = d[hi] if hi < m else np.inf
+    
+    return np.median(d), lower, upper
+
+
+# Sen's slope and intercept of the valid values x at time t, which the tests give from their own NaN mask,
+# so data are not preprocessed again. Time None is 0, ..., n-1, where short series skip the grouping of the slopes.
+def __sens_slope(x, t = None):
+    n = len(x)
+    
+    if t is not None:
+        slope = __grouped_slope_median([x], [t])
+        intercept = np.median(x) - np.median(t) * slope
+    else:
+        if n*(n-1)//2 <= max(8 * n, __threshold('slope_selection')):
+            slope = np.median(__sens_estimator(x)) if n > 1 else np.nan
+        else:
+            slope = __grouped_slope_median([x], [np.arange(n)])
+        
+        intercept = np.median(x) - (n-1)/2 * slope
+    
+    return slope, intercept
+
+
+def sens_slope(x, method = 'exact', tol = 0.001, alpha = 0.05, seed = None, assume_clean = False):
     """
     This method proposed by Theil (1950) and Sen (1968) to estimate the magnitude of the monotonic trend. Intercept calculated using Conover, W.J. (1980) method.
+    For very long series, method='approximate' takes the median of randomly sampled pairwise slopes. The No. of sampled pairs only depends on tol and alpha (about 1.8 million for the defaults), not on the length of data, so a series of 10 million values takes less than a second, where the exact method needs O(n^2) time and memory.
     Input:
         x:   a one dimensional vector (list, numpy array or pandas series) data
+        method: 'exact' (default) uses all pairwise slopes, 'approximate' uses randomly sampled pairwise slopes
+        tol: rank error of the approximate slope, as a fraction of all slopes (0.001 default, only for approximate method)
+        alpha: probability that the approximate slope is not within the rank error (0.05 default, only for approximate method)
+        seed: seed of the random sampling (default None, only for approximate method)
+        assume_clean: if True, x must be a float vector without missing values, which is used without any check (False default)
     Output:
         slope: Theil-Sen estimator/slope
         intercept: intercept of Kendall-Theil Robust Line
+        lower, upper: (only for approximate method) bounds of the exact slope with probability 1 - alpha
+        rank_error: (only for approximate method) rank error of the slope, 0 if it is exact
     Examples
     --------
       >>> import numpy as np
 	  >>> import pymannkendall as mk
       >>> x = np.random.rand(120)
       >>> slope,intercept = mk.sens_slope(x)
+      >>> x = np.random.rand(10000000)
+      >>> slope,intercept,lower,upper,rank_error = mk.sens_slope(x, method='approximate', seed=1)
+      >>> slope,intercept = mk.sens_slope(np.random.rand(30), assume_clean=True)
     """
     res = namedtuple('Sens_Slope_Test', ['slope','intercept'])
-    x, c = __preprocessing(x)
-#     x, n = __missing_values_analysis(x, method = 'skip')
-    n = len(x)
-    slope = np.nanmedian(__sens_estimator(x))
-    intercept = np.nanmedian(x) - np.median(np.arange(n)[~np.isnan(x.flatten())]) * slope  # or median(x) - (n-1)/2 *slope
+    x, t = __vector_data(x, assume_clean)
     
-    return res(slope, intercept)
+    if method == 'approximate':
+        res = namedtuple('Approximate_Sens_Slope_Test', ['slope', 'intercept', 'lower', 'upper', 'rank_error'])
+        
+        if t is None:
+            t = np.arange(len(x))
+        
+        # sampling is only used when it needs less pairs than the exact method
+        if np.ceil(np.log(2 / alpha) / (2 * tol**2)) < len(t) * (len(t) - 1) / 2:
+            slope, lower, upper = __sampled_slope(x, t, tol, alpha, seed)
+            rank_error = tol
+        else:
+            slope = __grouped_slope_median([x], [t])
+            lower, upper, rank_error = slope, slope, 0.
+        
+        intercept = np.median(x) - np.median(t) * slope
+        
+        return res(slope, intercept, lower, upper, rank_error)
+    
+    return res(*__sens_slope(x, t))
 
 
-def seasonal_sens_slope(x_old, period=12):
+def seasonal_sens_slope(x_old, period=12, seasons=None):
     """
     This method proposed by Hipel (1994) to estimate the magnitude of the monotonic trend, when data has seasonal effects. Intercept calculated using Conover, W.J. (1980) method.
     Input:
         x:   a vector (list, numpy array or pandas series) data
 		period: seasonal cycle. For monthly data it is 12, weekly data it is 52 (12 is the default)
+        seasons: season label (e.g. month number) or datetime of every observation (default None). If given, observations are grouped by label instead of by position, so irregular records can be used without padding. The cycle of a season label is its count, so only the last cycle can miss records; gappy records need datetime seasons. For datetime, period 12, 4 and 52 gives monthly, quarterly and weekly seasons.
     Output:
         slope: Theil-Sen estimator/slope
         intercept: intercept of Kendall-Theil Robust Line, where full period cycle consider as unit time step
@@ -204,32 +748,54 @@ def seasonal_sens_slope(x_old, period=12):
     """
     res = namedtuple('Seasonal_Sens_Slope_Test', ['slope','intercept'])
     x, c = __preprocessing(x_old)
-    n = len(x)
-    
-    if x.ndim == 1:
-        if np.mod(n,period) != 0:
-            x = np.pad(x,(0,period - np.mod(n,period)), 'constant', constant_values=(np.nan,))
-
-        x = x.reshape(int(len(x)/period),period)
+    groups, cycles, labels = __seasonal_groups(x, period, seasons)
     
 #     x, n = __missing_values_analysis(x, method = 'skip')
-    d = []
+    slope = __grouped_slope_median(groups, cycles)
     
-    for i in range(period):
-        d.extend(__sens_estimator(x[:,i]))
-        
-    slope = np.nanmedian(np.asarray(d))
-    intercept = np.nanmedian(x_old) - np.median(np.arange(x_old.size)[~np.isnan(x_old.flatten())]) / period * slope
+    if seasons is None:
+        intercept = np.nanmedian(x) - np.median(np.flatnonzero(~np.isnan(x.ravel()))) / period * slope
+    else:
+        # time of every observation from its cycle and season, which is the time scale of the slope
+        x = np.concatenate(groups)
+        t = np.concatenate([(cycles[i] * period + labels[i]) / period for i in range(len(groups))])
+        intercept = np.nanmedian(x) - np.median(t[~np.isnan(x)]) * slope
+    
+    return res(slope, intercept)
+
+
+def regional_sens_slope(x_old):
+    """
+    This method proposed by Helsel and Frans (2006) to estimate the magnitude of the regional trend, which is the median of the pairwise slopes of all stations. Slopes are selected without storing them, so thousands of stations can be used. Intercept calculated using Conover, W.J. (1980) method.
+    Input:
+        x:   a matrix of data, where every column is a station
+    Output:
+        slope: regional Theil-Sen estimator/slope
+        intercept: intercept of Kendall-Theil Robust Line, where every row (time step) of all stations consider as unit time step
+    Examples
+    --------
+      >>> import numpy as np
+	  >>> import pymannkendall as mk
+      >>> x = np.random.rand(1000,5)  # here consider 5 station/location where every station have 1000 data
+      >>> slope,intercept = mk.regional_sens_slope(x)
+    """
+    res = namedtuple('Regional_Sens_Slope_Test', ['slope','intercept'])
+    x, c = __preprocessing(x_old)
+    x = x.reshape(len(x), c)
+    
+    slope = __grouped_slope_median([x[:,i] for i in range(c)], [np.arange(len(x))] * c)
+    intercept = np.nanmedian(x) - np.median(np.flatnonzero(~np.isnan(x.ravel()))) / c * slope
     
     return res(slope, intercept)
 
 	
-def original_test(x_old, alpha = 0.05):
+def original_test(x_old, alpha = 0.05, assume_clean = False):
     """
     This function checks the Mann-Kendall (MK) test (Mann 1945, Kendall 1975, Gilbert 1987).
     Input:
         x: a vector (list, numpy array or pandas series) data
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+        assume_clean: if True, x must be a float vector without missing values, which is used without any check (False default)
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -248,8 +814,8 @@ def original_test(x_old, alpha = 0.05):
       >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.original_test(x,0.05)
     """
     res = namedtuple('Mann_Kendall_Test', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
-    x, c = __preprocessing(x_old)
-    x, n = __missing_values_analysis(x, method = 'skip')
+    x, t = __vector_data(x_old, assume_clean)
+    n = len(x)
     
     s = __mk_score(x, n)
     var_s = __variance_s(x, n)
@@ -257,17 +823,18 @@ def original_test(x_old, alpha = 0.05):
     
     z = __z_score(s, var_s)
     p, h, trend = __p_value(z, alpha)
-    slope, intercept = sens_slope(x_old)
+    slope, intercept = __sens_slope(x, t)
 
     return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
 
-def hamed_rao_modification_test(x_old, alpha = 0.05, lag=None):
+def hamed_rao_modification_test(x_old, alpha = 0.05, lag=None, assume_clean = False):
     """
     This function checks the Modified Mann-Kendall (MK) test using Hamed and Rao (1998) method.
     Input:
         x: a vector (list, numpy array or pandas series) data
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level. Significant lags depend on alpha, so var_s, z and p are also given for every level
         lag: No. of First Significant Lags (default None, You can use 3 for considering first 3 lags, which also proposed by Hamed and Rao(1998))
+        assume_clean: if True, x must be a float vector without missing values, which is used without any check (False default)
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -286,8 +853,8 @@ def hamed_rao_modification_test(x_old, alpha = 0.05, lag=None):
       >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.hamed_rao_modification_test(x,0.05)
     """
     res = namedtuple('Modified_Mann_Kendall_Test_Hamed_Rao_Approach', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
-    x, c = __preprocessing(x_old)
-    x, n = __missing_values_analysis(x, method = 'skip')
+    x, t = __vector_data(x_old, assume_clean)
+    n = len(x)
     
     s = __mk_score(x, n)
     var_s = __variance_s(x, n)
@@ -301,37 +868,48 @@ def hamed_rao_modification_test(x_old, alpha = 0.05, lag=None):
         
     # detrending
     # x_detrend = x - np.multiply(range(1,n+1), np.median(x))
-    slope, intercept = sens_slope(x_old)
+    slope, intercept = __sens_slope(x, t)
     x_detrend = x - np.arange(1,n+1) * slope
-    I = rankdata(x_detrend)
+    I = __R(x_detrend)
     
     # account for autocorrelation
     acf_1 = __acf(I, nlags=lag-1)
-    interval = norm.ppf(1 - alpha / 2) / np.sqrt(n)
-    upper_bound = 0 + interval
-    lower_bound = 0 - interval
-
-    sni = 0
-    for i in range(1,lag):
-        if (acf_1[i] <= upper_bound and acf_1[i] >= lower_bound):
-            sni = sni
-        else:
-            sni += (n-i) * (n-i-1) * (n-i-2) * acf_1[i]
-            
-    n_ns = 1 + (2 / (n * (n-1) * (n-2))) * abs(sni)
-    var_s = var_s * n_ns
     
-    z = __z_score(s, var_s)
-    p, h, trend = __p_value(z, alpha)
+    # significant lags depend on alpha, so the variance is corrected for every alpha
+    n_ns = []
+    for a in np.ravel(alpha):
+        interval = __critical_value(a) / np.sqrt(n)
+        upper_bound = 0 + interval
+        lower_bound = 0 - interval
+
+        sni = 0
+        for i in range(1,lag):
+            if (acf_1[i] <= upper_bound and acf_1[i] >= lower_bound):
+                sni = sni
+            else:
+                sni += (n-i) * (n-i-1) * (n-i-2) * acf_1[i]
+                
+        n_ns.append(1 + (2 / (n * (n-1) * (n-2))) * abs(sni))
+    
+    if np.ndim(alpha) == 0:
+        var_s = var_s * n_ns[0]
+        z = __z_score(s, var_s)
+        p, h, trend = __p_value(z, alpha)
+    else:
+        var_s = var_s * np.array(n_ns)
+        z = __z_score(s, var_s)
+        p, h, trend = zip(*[__p_value(z[i], a) for i, a in enumerate(np.ravel(alpha))])
+        p, h = np.array(p), np.array(h)
         
     return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
 
-def yue_wang_modification_test(x_old, alpha = 0.05, lag=None):
+def yue_wang_modification_test(x_old, alpha = 0.05, lag=None, assume_clean = False):
     """
     Input: This function checks the Modified Mann-Kendall (MK) test using Yue and Wang (2004) method.
         x: a vector (list, numpy array or pandas series) data
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
         lag: No. of First Significant Lags (default None, You can use 1 for considering first 1 lags, which also proposed by Yue and Wang (2004))
+        assume_clean: if True, x must be a float vector without missing values, which is used without any check (False default)
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -350,8 +928,8 @@ def yue_wang_modification_test(x_old, alpha = 0.05, lag=None):
       >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.yue_wang_modification_test(x,0.05)
     """
     res = namedtuple('Modified_Mann_Kendall_Test_Yue_Wang_Approach', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
-    x, c = __preprocessing(x_old)
-    x, n = __missing_values_analysis(x, method = 'skip')
+    x, t = __vector_data(x_old, assume_clean)
+    n = len(x)
     
     s = __mk_score(x, n)
     var_s = __variance_s(x, n)
@@ -364,7 +942,7 @@ def yue_wang_modification_test(x_old, alpha = 0.05, lag=None):
         lag = lag + 1
 
     # detrending
-    slope, intercept = sens_slope(x_old)
+    slope, intercept = __sens_slope(x, t)
     x_detrend = x - np.arange(1,n+1) * slope
     
     # account for autocorrelation
@@ -380,12 +958,13 @@ def yue_wang_modification_test(x_old, alpha = 0.05, lag=None):
 
     return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
 
-def pre_whitening_modification_test(x_old, alpha = 0.05):
+def pre_whitening_modification_test(x_old, alpha = 0.05, assume_clean = False):
     """
     This function checks the Modified Mann-Kendall (MK) test using Pre-Whitening method proposed by Yue and Wang (2002).
     Input:
         x: a vector (list, numpy array or pandas series) data
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+        assume_clean: if True, x must be a float vector without missing values, which is used without any check (False default)
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -404,8 +983,9 @@ def pre_whitening_modification_test(x_old, alpha = 0.05):
     """
     res = namedtuple('Modified_Mann_Kendall_Test_PreWhitening_Approach', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
     
-    x, c = __preprocessing(x_old)
-    x, n = __missing_values_analysis(x, method = 'skip')
+    x, t = __vector_data(x_old, assume_clean)
+    n = len(x)
+    slope, intercept = __sens_slope(x, t)
     
     # PreWhitening
     acf_1 = __acf(x, nlags=1)[1]
@@ -420,16 +1000,16 @@ def pre_whitening_modification_test(x_old, alpha = 0.05):
     
     z = __z_score(s, var_s)
     p, h, trend = __p_value(z, alpha)
-    slope, intercept = sens_slope(x_old)
     
     return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
 
-def trend_free_pre_whitening_modification_test(x_old, alpha = 0.05):
+def trend_free_pre_whitening_modification_test(x_old, alpha = 0.05, assume_clean = False):
     """
     This function checks the Modified Mann-Kendall (MK) test using the trend-free Pre-Whitening method proposed by Yue and Wang (2002).
     Input:
         x: a vector (list, numpy array or pandas series) data
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+        assume_clean: if True, x must be a float vector without missing values, which is used without any check (False default)
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -448,11 +1028,11 @@ def trend_free_pre_whitening_modification_test(x_old, alpha = 0.05):
     """
     res = namedtuple('Modified_Mann_Kendall_Test_Trend_Free_PreWhitening_Approach', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
     
-    x, c = __preprocessing(x_old)
-    x, n = __missing_values_analysis(x, method = 'skip')
+    x, t = __vector_data(x_old, assume_clean)
+    n = len(x)
     
     # detrending
-    slope, intercept = sens_slope(x_old)
+    slope, intercept = __sens_slope(x, t)
     x_detrend = x - np.arange(1,n+1) * slope
     
     # PreWhitening
@@ -470,17 +1050,63 @@ def trend_free_pre_whitening_modification_test(x_old, alpha = 0.05):
     
     z = __z_score(s, var_s)
     p, h, trend = __p_value(z, alpha)
-    slope, intercept = sens_slope(x_old)
     
     return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
 
 
-def multivariate_test(x_old, alpha = 0.05):
+# S, variance and sample size of several independent groups (columns/seasons) of deferent size
+def __multivariate_scores(groups):
+    s = np.zeros(len(groups))
+    var_s = np.zeros(len(groups))
+    n = np.zeros(len(groups), dtype=int)
+    
+    for i in range(len(groups)):
+        x_new, n[i] = __missing_values_analysis(groups[i], method = 'skip')  # It makes all column at deferent size
+
+        s[i] = __mk_score(x_new, n[i])
+        var_s[i] = __variance_s(x_new, n[i])
+    
+    return s, var_s, n
+
+
+# van Belle and Hughes (1984) chi-square decomposition from the block scores, Z = S / sqrt(var(S)) of every block.
+# z is (season,) or (season, station) shaped.
+def __homogeneity(z):
+    z = np.asarray(z, dtype=float)
+    total = np.sum(z**2)
+    trend = z.size * np.mean(z)**2
+    
+    chi = {'total': (total, z.size), 'trend': (trend, 1), 'homog': (total - trend, z.size - 1)}
+    
+    if z.ndim == 2:
+        (m, k) = z.shape
+        season = k * np.sum(np.mean(z, axis=1)**2) - trend
+        station = m * np.sum(np.mean(z, axis=0)**2) - trend
+        chi['season'] = (season, m - 1)
+        chi['station'] = (station, k - 1)
+        chi['interaction'] = (total - trend - season - station, (m - 1) * (k - 1))
+    
+    return chi
+
+
+# Block Z score, where a block without variance has no trend
+def __block_z(s, var_s):
+    s = np.asarray(s, dtype=float)
+    var_s = np.asarray(var_s, dtype=float)
+    z = np.zeros(s.shape)
+    valid = var_s > 0
+    z[valid] = s[valid] / np.sqrt(var_s[valid])
+    
+    return z
+
+
+def multivariate_test(x_old, alpha = 0.05, blocks = False):
     """
     This function checks the Multivariate Mann-Kendall (MK) test, which is originally proposed by R. M. Hirsch and J. R. Slack (1984) for the seasonal Mann-Kendall test. Later this method also used Helsel (2006) for Regional Mann-Kendall test.
     Input:
         x: a matrix of data
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+        blocks: if True, S, variance and sample size of every column are also returned (False default)
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -491,6 +1117,7 @@ def multivariate_test(x_old, alpha = 0.05):
         var_s: Variance S
         slope: Theil-Sen estimator/slope
         intercept: intercept of Kendall-Theil Robust Line
+        (only if blocks is True) s, var_s, n: arrays of S, variance and sample size for every column
     Examples
     --------
       >>> import numpy as np
@@ -499,40 +1126,37 @@ def multivariate_test(x_old, alpha = 0.05):
       >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.multivariate_test(x,0.05)
     """
     res = namedtuple('Multivariate_Mann_Kendall_Test', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
-    s = 0
-    var_s = 0
-    denom = 0
+    block_res = namedtuple('Mann_Kendall_Block_Scores', ['s', 'var_s', 'n'])
     
     x, c = __preprocessing(x_old)
 #     x, n = __missing_values_analysis(x, method = 'skip')  # It makes all column at the same size
 
-    for i in range(c):
-        if c == 1:
-            x_new, n = __missing_values_analysis(x, method = 'skip')  # It makes all column at deferent size
-        else:
-            x_new, n = __missing_values_analysis(x[:,i], method = 'skip')  # It makes all column at deferent size
-
-        s = s + __mk_score(x_new, n)
-        var_s = var_s + __variance_s(x_new, n)
-        denom = denom + (.5*n*(n-1))
-              
-    Tau = s/denom
+    s_b, var_s_b, n_b = __block_scores(x.reshape(len(x), c))
+    s = np.sum(s_b)
+    var_s = np.sum(var_s_b)
+    Tau = s/np.sum(.5*n_b*(n_b-1))
     
     z = __z_score(s, var_s)
     p, h, trend = __p_value(z, alpha)
 
-    slope, intercept = seasonal_sens_slope(x_old, period = c)
+    slope, intercept = regional_sens_slope(x_old)
+    result = res(trend, h, p, z, Tau, s, var_s, slope, intercept)
     
-    return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
+    if blocks:
+        return result, block_res(s_b, var_s_b, n_b)
+    
+    return result
 
 
-def seasonal_test(x_old, period = 12, alpha = 0.05):
+def seasonal_test(x_old, period = 12, alpha = 0.05, seasons = None, blocks = False):
     """
     This function checks the  Seasonal Mann-Kendall (MK) test (Hirsch, R. M., Slack, J. R. 1984).
     Input:
         x:   a vector of data
         period: seasonal cycle. For monthly data it is 12, weekly data it is 52 (12 is the default)
-        alpha: significance level (0.05 is the default)
+        alpha: significance level (0.05 is the default), or a sequence of levels to get h and trend for every level
+        seasons: season label (e.g. month number) or datetime of every observation (default None). If given, observations are grouped by label instead of by position, so irregular records can be used without padding. The cycle of a season label is its count, so only the last cycle can miss records; gappy records need datetime seasons. For datetime, period 12, 4 and 52 gives monthly, quarterly and weekly seasons.
+        blocks: if True, S, variance and sample size of every season are also returned (False default)
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -543,6 +1167,7 @@ def seasonal_test(x_old, period = 12, alpha = 0.05):
         var_s: Variance S
         slope: Theil-Sen estimator/slope
         intercept: intercept of Kendall-Theil Robust Line, where full period cycle consider as unit time step
+        (only if blocks is True) s, var_s, n: arrays of S, variance and sample size for every season
     Examples
     --------
       >>> import numpy as np
@@ -551,26 +1176,57 @@ def seasonal_test(x_old, period = 12, alpha = 0.05):
       >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.seasonal_test(x,0.05)
     """
     res = namedtuple('Seasonal_Mann_Kendall_Test', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
+    block_res = namedtuple('Mann_Kendall_Block_Scores', ['s', 'var_s', 'n'])
     x, c = __preprocessing(x_old)
-    n = len(x)
     
-    if x.ndim == 1:
-        if np.mod(n,period) != 0:
-            x = np.pad(x,(0,period - np.mod(n,period)), 'constant', constant_values=(np.nan,))
-
-        x = x.reshape(int(len(x)/period),period)
+    if x.ndim == 2:
+        period = c
+    
+    groups, cycles, labels = __seasonal_groups(x, period, seasons)
+    s_b, var_s_b, n_b = __multivariate_scores(groups)
+    s = np.sum(s_b)
+    var_s = np.sum(var_s_b)
+    Tau = s/np.sum(.5*n_b*(n_b-1))
+    
+    z = __z_score(s, var_s)
+    p, h, trend = __p_value(z, alpha)
+    slope, intercept = seasonal_sens_slope(x, period = period, seasons = seasons)
+    result = res(trend, h, p, z, Tau, s, var_s, slope, intercept)
     
-    trend, h, p, z, Tau, s, var_s, slope, intercept = multivariate_test(x, alpha = alpha)
+    if blocks:
+        return result, block_res(s_b, var_s_b, n_b)
 
-    return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
+    return result
 
 
-def regional_test(x_old, alpha = 0.05):
+# regional S of bootstrap resamples, where whole time slices are resampled to keep the cross-correlation of stations (Douglas et al. 2000).
+# Resamples are stacked as extra columns, so S of all stations of a batch of resamples is one vectorised pass.
+def __bootstrap_scores(args):
+    x, n_boot, seed = args
+    (n, c) = x.shape
+    rng = np.random.default_rng(seed)
+    batch = max(1, min(n_boot, 2**22 // (n * n * c)))
+    s = np.empty(n_boot)
+    
+    for i in range(0, n_boot, batch):
+        b = min(batch, n_boot - i)
+        idx = rng.integers(0, n, size=(n, b))
+        s[i:i+b] = __block_mk_score(x[idx].reshape(n, b * c)).reshape(b, c).sum(axis=1)
+    
+    return s
+
+
+def regional_test(x_old, alpha = 0.05, blocks = False, method = 'original', n_boot = 1000, seed = None, n_jobs = 1):
     """
-    This function checks the Regional Mann-Kendall (MK) test (Helsel 2006).
+    This function checks the Regional Mann-Kendall (MK) test (Helsel 2006). For cross-correlated stations, the bootstrap method of Douglas et al. (2000) resamples whole time slices to calculate the significance.
     Input:
         x:   a matrix of data
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+        blocks: if True, S, variance and sample size of every station are also returned (False default)
+        method: 'original' (default) considers stations are independent, 'bootstrap' considers the cross-correlation of stations
+        n_boot: No. of bootstrap resamples (1000 default, only for bootstrap method)
+        seed: seed of the random resampling (default None, only for bootstrap method)
+        n_jobs: No. of processes to run the resamples (1 default, only for bootstrap method)
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -581,18 +1237,169 @@ def regional_test(x_old, alpha = 0.05):
         var_s: Variance S
         slope: Theil-Sen estimator/slope
         intercept: intercept of Kendall-Theil Robust Line
+        n_boot: (only for bootstrap method) No. of bootstrap resamples
+        throughput: (only for bootstrap method) bootstrap resamples per second
+        (only if blocks is True) s, var_s, n: arrays of S, variance and sample size for every station
     Examples
     --------
       >>> import numpy as np
 	  >>> import pymannkendall as mk
       >>> x = np.random.rand(1000,5)  # here consider 5 station/location where every station have 1000 data
       >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.regional_test(x,0.05)
+      >>> trend,h,p,z,tau,s,var_s,slope,intercept,n_boot,throughput = mk.regional_test(x,0.05,method='bootstrap',seed=1)
     """
     res = namedtuple('Regional_Mann_Kendall_Test', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
     
-    trend, h, p, z, Tau, s, var_s, slope, intercept = multivariate_test(x_old)
+    (trend, h, p, z, Tau, s, var_s, slope, intercept), block = multivariate_test(x_old, alpha = alpha, blocks = True)
     
-    return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
+    if method == 'bootstrap':
+        res = namedtuple('Regional_Mann_Kendall_Test_Bootstrap', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept', 'n_boot', 'throughput'])
+        x, c = __preprocessing(x_old)
+        x = x.reshape(len(x), c)
+        
+        # fixed chunks with their own seed, so the result does not depend on n_jobs
+        chunk = 100
+        seeds = np.random.SeedSequence(seed).spawn(int(np.ceil(n_boot / chunk)))
+        jobs = [(x, min(chunk, n_boot - i * chunk), seeds[i]) for i in range(len(seeds))]
+        
+        start = time.time()
+        
+        if n_jobs == 1:
+            s_boot = np.concatenate([__bootstrap_scores(job) for job in jobs])
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            
+            with ProcessPoolExecutor(max_workers = n_jobs) as pool:
+                s_boot = np.concatenate(list(pool.map(__bootstrap_scores, jobs)))
+        
+        throughput = n_boot / max(time.time() - start, 1e-9)
+        
+        var_s = np.var(s_boot)
+        z = __z_score(s, var_s)
+        p = np.mean(np.abs(s_boot) >= abs(s))
+        h = p < np.asarray(alpha)
+        trend = __trend_names[np.where(h, np.sign(s), 0).astype(np.int8) + 1]
+        trend = str(trend) if h.ndim == 0 else tuple(str(t) for t in trend)
+        
+        result = res(trend, h[()], p, z, Tau, s, var_s, slope, intercept, n_boot, throughput)
+    else:
+        result = res(trend, h, p, z, Tau, s, var_s, slope, intercept)
+    
+    if blocks:
+        return result, block
+    
+    return result
+
+
+def regional_seasonal_test(x_old, alpha = 0.05, blocks = False):
+    """
+    This function checks the Regional Seasonal Mann-Kendall (MK) test, where the seasonal test (Hirsch, R. M., Slack, J. R. 1984) of every station is combined like the Regional test (Helsel 2006). S and variance of all station-season blocks are calculated together in one vectorised pass.
+    Input:
+        x:   a 3 dimensional array (time, season, station) of data
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+        blocks: if True, S, variance and sample size of every (season, station) block are also returned (False default)
+    Output:
+        trend: tells the trend (increasing, decreasing or no trend)
+        h: True (if trend is present) or False (if trend is absence)
+        p: p-value of the significance test
+        z: normalized test statistics
+        Tau: Kendall Tau
+        s: Mann-Kendal's score
+        var_s: Variance S
+        slope: Theil-Sen estimator/slope
+        intercept: intercept of Kendall-Theil Robust Line, where full period cycle consider as unit time step
+        (only if blocks is True) s, var_s, n: arrays of (season, station) shape for every block
+    Examples
+    --------
+      >>> import numpy as np
+	  >>> import pymannkendall as mk
+      >>> x = np.random.rand(30, 12, 5)  # here consider 30 years of monthly data at 5 station/location
+      >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.regional_seasonal_test(x,0.05)
+      >>> result, block = mk.regional_seasonal_test(x, 0.05, blocks=True)
+    """
+    res = namedtuple('Regional_Seasonal_Mann_Kendall_Test', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
+    block_res = namedtuple('Mann_Kendall_Block_Scores', ['s', 'var_s', 'n'])
+    
+    x = np.asarray(x_old).astype(float)
+    
+    if x.ndim != 3:
+        raise ValueError('Regional Seasonal Mann Kendall test required a 3 dimensional (time, season, station) data. Here dimension is ' + str(x.ndim) + '.')
+    
+    (n, period, c) = x.shape
+    x_new = x.reshape(n, period * c)
+    
+    s_b, var_s_b, n_b = __block_scores(x_new)
+    s = np.sum(s_b)
+    var_s = np.sum(var_s_b)
+    Tau = s/np.sum(.5*n_b*(n_b-1))
+    
+    z = __z_score(s, var_s)
+    p, h, trend = __p_value(z, alpha)
+    
+    t = np.arange(n)
+    slope = __grouped_slope_median([x_new[:,i] for i in range(period * c)], [t] * (period * c))
+    
+    time = np.broadcast_to((t[:,None] + np.arange(period)[None,:] / period)[:,:,None], x.shape)
+    intercept = np.nanmedian(x) - np.median(time[~np.isnan(x)]) * slope
+    
+    result = res(trend, h, p, z, Tau, s, var_s, slope, intercept)
+    
+    if blocks:
+        return result, block_res(s_b.reshape(period, c), var_s_b.reshape(period, c), n_b.reshape(period, c))
+    
+    return result
+
+
+def homogeneity_test(x_old, alpha = 0.05):
+    """
+    This function checks the homogeneity of trend direction between seasons and/or stations (van Belle, G. and Hughes, J. P. 1984), which should be checked before relying on the seasonal or regional test. Only S and variance of every block are needed, so the block scores returned by multivariate_test, seasonal_test, regional_test or regional_seasonal_test with blocks=True can be used without another pass over the data.
+    Input:
+        x:   a matrix of data, where every column is a season or station; a 3 dimensional array (time, season, station) of data; or block scores returned with blocks=True
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+    Output:
+        h: True (if trends are not homogeneous) or False (if trends are homogeneous)
+        chi2_homog: chi-square statistic of the homogeneity test
+        p_homog: p-value of the homogeneity test
+        chi2_trend: chi-square statistic of the common trend
+        p_trend: p-value of the common trend
+        chi2_season, p_season, chi2_station, p_station, chi2_interaction, p_interaction: (only for (season, station) data) chi-square statistics and p-values of the season and station homogeneity and of their interaction
+    Examples
+    --------
+      >>> import numpy as np
+	  >>> import pymannkendall as mk
+      >>> x = np.random.rand(30, 12, 5)
+      >>> h,chi2_homog,p_homog,chi2_trend,p_trend,chi2_season,p_season,chi2_station,p_station,chi2_interaction,p_interaction = mk.homogeneity_test(x,0.05)
+      >>> result, block = mk.seasonal_test(np.random.rand(360), blocks=True)
+      >>> h,chi2_homog,p_homog,chi2_trend,p_trend = mk.homogeneity_test(block)
+    """
+    if hasattr(x_old, 'var_s') and hasattr(x_old, 'n'):
+        block = x_old
+    else:
+        x = np.asarray(x_old).astype(float)
+        
+        if x.ndim == 3:
+            result, block = regional_seasonal_test(x, alpha = alpha, blocks = True)
+        elif x.ndim == 2:
+            result, block = multivariate_test(x, alpha = alpha, blocks = True)
+        else:
+            raise ValueError('Homogeneity test required a matrix, a 3 dimensional (time, season, station) data or block scores.')
+    
+    chi = __homogeneity(__block_z(block.s, block.var_s))
+    names = ['homog', 'trend'] + [k for k in ['season', 'station', 'interaction'] if k in chi]
+    
+    values = []
+    for k in names:
+        stat, df = chi[k]
+        values.extend([stat, __chi2_sf(stat, df)])
+    
+    if len(names) == 2:
+        res = namedtuple('Homogeneity_Test', ['h', 'chi2_homog', 'p_homog', 'chi2_trend', 'p_trend'])
+    else:
+        res = namedtuple('Seasonal_Regional_Homogeneity_Test', ['h', 'chi2_homog', 'p_homog', 'chi2_trend', 'p_trend', 'chi2_season', 'p_season', 'chi2_station', 'p_station', 'chi2_interaction', 'p_interaction'])
+    
+    h = values[1] < np.asarray(alpha)
+    
+    return res(h, *values)
 
 
 def correlated_multivariate_test(x_old, alpha = 0.05):
@@ -600,7 +1407,7 @@ def correlated_multivariate_test(x_old, alpha = 0.05):
     This function checks the Correlated Multivariate Mann-Kendall (MK) test (Libiseller and Grimvall (2002)).
     Input:
         x:   a matrix of data
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -631,23 +1438,7 @@ def correlated_multivariate_test(x_old, alpha = 0.05):
  
     Tau = s/denom
 
-    Gamma = np.ones([c,c])
-
-    for i in range(1,c):
-        for j in range(i):
-            k = __K(x[:,i], x[:,j])
-            ri = __R(x[:,i])
-            rj = __R(x[:,j])
-            Gamma[i,j] = (k + 4 * np.sum(ri * rj) - n*(n+1)**2)/3
-            Gamma[j,i] = Gamma[i,j]
-
-    for i in range(c):
-        k = __K(x[:,i], x[:,i])
-        ri = __R(x[:,i])
-        rj = __R(x[:,i])
-        Gamma[i,i] = (k + 4 * np.sum(ri * rj) - n*(n+1)**2)/3
-    
-    
+    Gamma = __gamma(x)
     var_s = np.sum(Gamma)
     
     z = s / np.sqrt(var_s)
@@ -658,13 +1449,14 @@ def correlated_multivariate_test(x_old, alpha = 0.05):
     return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
 
 
-def correlated_seasonal_test(x_old, period = 12 ,alpha = 0.05):
+def correlated_seasonal_test(x_old, period = 12 ,alpha = 0.05, seasons = None):
     """
     This function checks the Correlated Seasonal Mann-Kendall (MK) test (Hipel [1994] ).
     Input:
         x:   a matrix of data
 		period: seasonal cycle. For monthly data it is 12, weekly data it is 52 (12 is default)
-        alpha: significance level (0.05 default)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+        seasons: season label (e.g. month number) or datetime of every observation (default None). Every season and cycle (year) can have only one observation. Season labels must be given for every cycle, as the cycle of a label is its count; missing records need datetime seasons. For weekly datetime, week 53 of long ISO years is not in every cycle, so it is not used.
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -687,13 +1479,32 @@ def correlated_seasonal_test(x_old, period = 12 ,alpha = 0.05):
 
     n = len(x)
     
-    if x.ndim == 1:
+    if seasons is not None:
+        # covariance between seasons needs the (cycle, season) table, so it is built directly from the labels
+        groups, cycles, labels = __seasonal_groups(x, period, seasons)
+        
+        if np.issubdtype(np.asarray(seasons).dtype, np.datetime64):
+            # week 53 is dropped by its label, so an empty season before it does not shift it into the table
+            keep = np.flatnonzero(labels < period)
+            groups, cycles = [groups[i] for i in keep], [cycles[i] for i in keep]
+        elif len(set(len(g) for g in groups)) > 1:
+            raise ValueError('Correlated seasonal test required datetime seasons for missing records, as the cycle of a season label is its count. Here seasons have ' + ', '.join(sorted(set(str(len(g)) for g in groups))) + ' observations.')
+        
+        x = np.full((max(t.max() for t in cycles) + 1, len(groups)), np.nan)
+        
+        for i in range(len(groups)):
+            if len(np.unique(cycles[i])) != len(cycles[i]):
+                raise ValueError('Correlated seasonal test required only one observation in every season of a cycle.')
+            
+            x[cycles[i], i] = groups[i]
+    
+    elif x.ndim == 1:
         if np.mod(n,period) != 0:
             x = np.pad(x,(0,period - np.mod(n,period)), 'constant', constant_values=(np.nan,))
 
         x = x.reshape(int(len(x)/period),period)
     
-    trend, h, p, z, Tau, s, var_s, slope, intercept = correlated_multivariate_test(x)
+    trend, h, p, z, Tau, s, var_s, slope, intercept = correlated_multivariate_test(x, alpha = alpha)
 
     return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
 
@@ -702,8 +1513,8 @@ def partial_test(x_old, alpha = 0.05):
     """
     This function checks the Partial Mann-Kendall (MK) test (Libiseller and Grimvall (2002)).
     Input:
-        x: a matrix with 2 columns
-        alpha: significance level (0.05 default)
+        x: a matrix, where the first column is the response and the other columns are the independent parameters (covariates)
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
     Output:
         trend: tells the trend (increasing, decreasing or no trend)
         h: True (if trend is present) or False (if trend is absence)
@@ -719,36 +1530,251 @@ def partial_test(x_old, alpha = 0.05):
 	  >>> import pymannkendall as mk
       >>> x = np.random.rand(1000, 2)
       >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.partial_test(x,0.05)
+      >>> x = np.random.rand(1000, 4)  # response with 3 covariates
+      >>> trend,h,p,z,tau,s,var_s,slope,intercept = mk.partial_test(x,0.05)
     """
     res = namedtuple('Partial_Mann_Kendall_Test', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept'])
     
-    x_proc, c = __preprocessing(x_old)
-    x_proc, n = __missing_values_analysis(x_proc, method = 'skip')
-    
-    if c != 2:
-        raise ValueError('Partial Mann Kendall test required two parameters/columns. Here column no ' + str(c) + ' is not equal to 2.')
-    
-    x = x_proc[:,0]
-    y = x_proc[:,1]
+    x, c = __preprocessing(x_old)
+    x_proc, n = __missing_values_analysis(x, method = 'skip')
     
-    x_score = __mk_score(x, n)
-    y_score = __mk_score(y, n)
+    if c < 2:
+        raise ValueError('Partial Mann Kendall test required at least two parameters/columns. Here column no ' + str(c) + ' is less than 2.')
     
-    k = __K(x, y)
-    rx = __R(x)
-    ry = __R(y)
+    score = np.array([__mk_score(x_proc[:,i], n) for i in range(c)])
     
-    sigma = (k + 4 * np.sum(rx * ry) - n*(n+1)**2)/3
-    rho = sigma / (n*(n-1)*(2*n+5)/18)
+    # correlation between the scores, where every score has the variance without ties
+    rho = __gamma(x_proc) / (n*(n-1)*(2*n+5)/18)
+    np.fill_diagonal(rho, 1)
     
-    s = x_score - rho * y_score
-    var_s = (1 - rho**2) * (n*(n-1)*(2*n+5))/18
+    # condition the response score on the covariate scores
+    w = np.linalg.solve(rho[1:,1:], rho[1:,0])
+    s = score[0] - np.dot(w, score[1:])
+    r2 = np.dot(w, rho[1:,0])
+    var_s = (1 - r2) * (n*(n-1)*(2*n+5))/18
     
-    Tau = x_score/(.5*n*(n-1))
+    Tau = score[0]/(.5*n*(n-1))
     
     z = s / np.sqrt(var_s)
 
     p, h, trend = __p_value(z, alpha)
-    slope, intercept = sens_slope(x_old[:,0])
+    slope, intercept = __sens_slope(*__valid_values(x[:,0]))
 
     return res(trend, h, p, z, Tau, s, var_s, slope, intercept)
+
+
+# Sequential statistic u(t) of Sneyers (1990), where every value is compared with all of its preceding values.
+# Values are ranked by (-x, time), so the preceding greater ranks are the preceding smaller values and ties are not counted.
+def __sequential_u(x):
+    n = len(x)
+    r = np.empty(n, dtype=np.int64)
+    r[np.lexsort((np.arange(n), -x))] = np.arange(n)
+    
+    t = np.cumsum(__inversions(r, per_element = True))
+    k = np.arange(1, n+1)
+    var_t = k*(k-1)*(2*k+5)/72
+    
+    u = np.zeros(n)
+    u[1:] = (t[1:] - k[1:]*(k[1:]-1)/4) / np.sqrt(var_t[1:])
+    
+    return u
+
+
+def sequential_test(x_old, alpha = 0.05):
+    """
+    This function calculates the progressive and retrograde series of the Sequential Mann-Kendall test (Sneyers 1990), which are used to find the starting point of a trend. Ranks of every value among its preceding values are counted by merge sort, so it takes O(n log n) time.
+    Input:
+        x: a vector (list, numpy array or pandas series) data
+        alpha: significance level (0.05 default), or a sequence of levels to get change points for every level
+    Output:
+        u_prog: progressive series u(t)
+        u_retro: retrograde series u'(t), calculated from the end of the series
+        change_points: index of the values where the progressive and retrograde series cross each other inside the confidence interval, a list of them for a sequence of alpha
+    Examples
+    --------
+	  >>> import numpy as np
+      >>> import pymannkendall as mk
+      >>> x = np.random.rand(1000)
+      >>> u_prog,u_retro,change_points = mk.sequential_test(x,0.05)
+      >>> u_prog,u_retro,change_points = mk.sequential_test(x,[0.01, 0.05])
+    """
+    res = namedtuple('Sequential_Mann_Kendall_Test', ['u_prog', 'u_retro', 'change_points'])
+    x, c = __preprocessing(x_old)
+    x, n = __missing_values_analysis(x, method = 'skip')
+    
+    u_prog = __sequential_u(x)
+    u_retro = -__sequential_u(x[::-1])[::-1]
+    
+    # crossing between t and t+1 is assigned to the nearer point
+    d = u_prog - u_retro
+    cross = np.flatnonzero(np.sign(d[:-1]) * np.sign(d[1:]) < 0)
+    cross = np.where(np.abs(d[cross]) <= np.abs(d[cross+1]), cross, cross+1)
+    cross = np.union1d(cross, np.flatnonzero(d == 0))
+    
+    if np.ndim(alpha) > 0:
+        change_points = [cross[np.abs(u_prog[cross]) < z] for z in __critical_value(alpha)]
+    else:
+        change_points = cross[np.abs(u_prog[cross]) < __critical_value(alpha)]
+    
+    return res(u_prog, u_retro, change_points)
+
+
+def trend_matrix(x_old, min_length = 2, filename = None):
+    """
+    This function calculates the Mann-Kendall S, variance, z and p-value of every window (start, end) of the data, which is used to check how the trend depends on the study period. Every window is extended from the next window by one value, so all windows take O(n^2) time instead of O(n^4) with original_test.
+    Input:
+        x: a vector (list, numpy array or pandas series) data
+        min_length: minimum window length, shorter windows are not calculated (2 default)
+        filename: if given, all matrices are stored in this .npy file as a memory-mapped (4, n, n) array (default None)
+    Output:
+        s: Mann-Kendal's score of every window, where s[i, j] is the window from value i to value j (NaN for windows shorter than min_length)
+        var_s: Variance S of every window
+        z: normalized test statistics of every window
+        p: p-value of the significance test of every window
+    Examples
+    --------
+	  >>> import numpy as np
+      >>> import pymannkendall as mk
+      >>> x = np.random.rand(100)
+      >>> s,var_s,z,p = mk.trend_matrix(x, min_length = 10)
+      >>> s,var_s,z,p = mk.trend_matrix(x, min_length = 10, filename = 'trend_matrix.npy')
+    """
+    res = namedtuple('Trend_Matrix', ['s', 'var_s', 'z', 'p'])
+    x, c = __preprocessing(x_old)
+    n = len(x)
+    
+    if filename is None:
+        out = np.full((4, n, n), np.nan)
+    else:
+        out = np.lib.format.open_memmap(filename, mode='w+', dtype=float, shape=(4, n, n))
+        out[...] = np.nan
+    
+    # missing values are not compared with any value, so they only do not count in the window length
+    valid = np.concatenate(([0], np.cumsum(~np.isnan(x))))
+    s = np.zeros(n, dtype=np.int64)
+    ties = np.zeros(n)
+    
+    for i in range(n-1, -1, -1):
+        # window (i, j) = window (i+1, j) + comparisons of x[i] with x[i+1], ..., x[j]
+        s[i:] += np.cumsum((x[i:] > x[i]).astype(np.int64) - (x[i:] < x[i]))
+        
+        # x[i] makes its tied group in the window t values large, so t(t-1)(2t+5) grows by 6(t^2 - 1)
+        if not np.isnan(x[i]):
+            t = np.cumsum(x[i:] == x[i])
+            ties[i:] += 6. * (t**2 - 1)
+        
+        start = i + max(min_length, 1) - 1
+        
+        if start >= n:
+            continue
+        
+        w = valid[start+1:] - valid[i]
+        var_s = (w*(w-1)*(2*w+5) - ties[start:])/18
+        z = __z_score(s[start:], var_s)
+        
+        out[0, i, start:] = s[start:]
+        out[1, i, start:] = var_s
+        out[2, i, start:] = z
+        out[3, i, start:] = 2*(1-__ndtr(np.abs(z)))
+    
+    if filename is not None:
+        out.flush()
+    
+    return res(out[0], out[1], out[2], out[3])
+
+
+# t(t-1)(2t+5) of tied groups, the tie correction of var(S)
+def __tie_term(t):
+    return t*(t-1)*(2*t+5)
+
+
+# load the expanding test state from a .npz file, or start a new one
+def __load_state(state):
+    if state is None or (isinstance(state, str) and not os.path.exists(state)):
+        return {'x': np.zeros(0), 't': np.zeros(0, dtype=np.int64), 'length': 0, 'sorted': np.zeros(0), 's': 0, 'ties': 0.}
+    
+    if isinstance(state, str):
+        with np.load(state) as f:
+            return {'x': f['x'], 't': f['t'], 'length': int(f['length']), 'sorted': f['sorted'], 's': int(f['s']), 'ties': float(f['ties'])}
+    
+    return state
+
+
+# save the expanding test state, a partly written file never replaces the last good one
+def __save_state(state, filename):
+    with open(filename + '.tmp', 'wb') as f:
+        np.savez(f, **state)
+    
+    os.replace(filename + '.tmp', filename)
+
+
+def expanding_test(x_new, state = None, alpha = 0.05, slope = False):
+    """
+    This function updates the Mann-Kendall (MK) test of an expanding series with new data, without calculating the test of the whole history again. The state (history with time, sorted values, S and tie correction) is returned and can be saved to a local .npz file, so k new values cost O(k log n) comparisons in the next run.
+    Input:
+        x_new: a vector (list, numpy array or pandas series) of new data
+        state: None to start a new series (default), state returned by the previous update or .npz file name. A file is loaded if it exists and the new state is written to it.
+        alpha: significance level (0.05 default), or a sequence of levels to get h and trend for every level
+        slope: if True, Theil-Sen estimator/slope of the whole history is also calculated, which takes O(n log n) time (False default)
+    Output:
+        trend: tells the trend (increasing, decreasing or no trend)
+        h: True (if trend is present) or False (if trend is absence)
+        p: p-value of the significance test
+        z: normalized test statistics
+        Tau: Kendall Tau
+        s: Mann-Kendal's score
+        var_s: Variance S
+        slope: Theil-Sen estimator/slope (NaN if slope is False)
+        intercept: intercept of Kendall-Theil Robust Line (NaN if slope is False)
+        n: No. of data in the history
+    and the updated state.
+    Examples
+    --------
+	  >>> import numpy as np
+      >>> import pymannkendall as mk
+      >>> result, state = mk.expanding_test(np.random.rand(1000))
+      >>> result, state = mk.expanding_test(np.random.rand(10), state)
+      >>> result, state = mk.expanding_test(np.random.rand(10), 'trend_state.npz')  # next run resumes from the file
+    """
+    res = namedtuple('Expanding_Mann_Kendall_Test', ['trend', 'h', 'p', 'z', 'Tau', 's', 'var_s', 'slope', 'intercept', 'n'])
+    x, c = __preprocessing(x_new)
+    old = __load_state(state)
+    
+    # missing values are skipped, but they still count in the time of the next values
+    t = old['length'] + np.flatnonzero(~np.isnan(x))
+    length = old['length'] + len(x)
+    x, k = __missing_values_analysis(x, method = 'skip')
+    
+    # comparisons of every new value with the history, and among the new values
+    sorted_old = old['sorted']
+    below = np.searchsorted(sorted_old, x, side='left')
+    above = len(sorted_old) - np.searchsorted(sorted_old, x, side='right')
+    s = old['s'] + int(np.sum(below) - np.sum(above))
+    
+    if k > 1:
+        s = s + int(__K(x, np.arange(k)))
+    
+    # tied groups grow by the No. of equal new values
+    values, counts = np.unique(x, return_counts=True)
+    m = np.searchsorted(sorted_old, values, side='right') - np.searchsorted(sorted_old, values, side='left')
+    ties = old['ties'] + float(np.sum(__tie_term(m + counts) - __tie_term(m)))
+    
+    new = {'x': np.concatenate((old['x'], x)), 't': np.concatenate((old['t'], t)), 'length': length, 'sorted': np.insert(sorted_old, np.searchsorted(sorted_old, values, side='right').repeat(counts), np.sort(x)), 's': s, 'ties': ties}
+    
+    if isinstance(state, str):
+        __save_state(new, state)
+    
+    n = len(new['x'])
+    var_s = (n*(n-1)*(2*n+5) - ties)/18
+    Tau = s/(.5*n*(n-1))
+    
+    z = __z_score(s, var_s)
+    p, h, trend = __p_value(z, alpha)
+    
+    if slope:
+        b = __grouped_slope_median([new['x']], [new['t']])
+        intercept = np.median(new['x']) - np.median(new['t']) * b
+    else:
+        b, intercept = np.nan, np.nan
+    
+    return res(trend, h, p, z, Tau, s, var_s, b, intercept, n), new
@@ -0,0 +1,132 @@
+"""
+Seeded synthetic data for benchmarks and load tests of the trend tests: AR(1) noise with a linear trend, seasonal cycles,
+ties, missing value gaps, censored values and cross-correlated stations.
+Approach: Data are generated in fixed chunks of time steps, so the same seed gives the same data in memory
+and in a memory-mapped .npy file, and a memory-mapped file of any size only needs the memory of one chunk.
+"""
+
+from __future__ import division
+import numpy as np
+
+__chunk = 2**16
+
+# settings which exercise the tests at scale, every setting can be changed by generate_workload
+WORKLOADS = {
+    'hamed_rao': dict(n = 10**4, slope = 1e-5, phi = 0.6, decimals = 2, nans = 0.01, gap = 5),
+    'seasonal': dict(n = 50 * 365, period = 365, amplitude = 2., slope = 1e-4, phi = 0.3, decimals = 1, nans = 0.05, gap = 30),
+    'correlated_multivariate': dict(n = 10**4, stations = 20, rho = 0.6, slope = 1e-4, phi = 0.3, decimals = 2),
+    'censored': dict(n = 10**4, stations = 10, rho = 0.3, slope = 1e-4, censor = -1.),
+}
+
+
+# gaps of missing values, where a gap starts at every time step with probability nans / gap,
+# so about a fraction nans of the data is missing. carry holds the gap starts of the previous gap - 1 time steps.
+def __gaps(rng, shape, nans, gap, carry):
+    starts = rng.random_sample(shape) < nans / gap
+    starts = np.concatenate((carry, starts))
+    
+    count = np.cumsum(starts, axis=0)
+    count[gap:] = count[gap:] - count[:-gap]
+    
+    return count[len(carry):] > 0, starts[len(starts) - (gap - 1):]
+
+
+def generate(n, stations = 1, period = None, amplitude = 0., slope = 0., phi = 0., sigma = 1., rho = 0., decimals = None, nans = 0., gap = 1, censor = None, seed = None, filename = None):
+    """
+    This function generates seeded synthetic data, x[t] = slope * t + amplitude * sin(2 pi t / period) + e[t], where e is AR(1) noise.
+    Input:
+        n: No. of time steps
+        stations: No. of stations (columns), every station has the same trend and cycle (1 default gives a vector)
+        period: seasonal cycle, e.g. 12 for monthly data (default None, no cycle)
+        amplitude: amplitude of the seasonal cycle (0 default)
+        slope: trend per time step (0 default)
+        phi: lag-1 autocorrelation of the AR(1) noise (0 default)
+        sigma: standard deviation of the noise (1 default)
+        rho: cross-correlation of the noise of every two stations (0 default)
+        decimals: if given, data are rounded to this No. of decimals, which makes ties (default None)
+        nans: fraction of missing values (0 default)
+        gap: mean length of the gaps of missing values (1 default)
+        censor: if given, values below this detection limit are censored to the limit (default None)
+        seed: seed of the random data (default None)
+        filename: if given, data are written to this .npy file and returned as a memory-mapped array (default None)
+    Output:
+        x: (n,) array for one station, otherwise (n, stations) array
+    Examples
+    --------
+      >>> import pymannkendall as mk
+      >>> from pymannkendall.synthetic import generate
+      >>> x = generate(10000, slope = 1e-4, phi = 0.5, decimals = 1, nans = 0.05, seed = 1)
+      >>> result = mk.hamed_rao_modification_test(x)
+      >>> x = generate(10**7, stations = 20, rho = 0.5, seed = 1, filename = 'stations.npy')
+    """
+    from scipy.signal import lfilter
+    
+    rng = np.random.RandomState(seed)
+    shape = (n,) if stations == 1 else (n, stations)
+    
+    if filename is None:
+        x = np.empty(shape)
+    else:
+        x = np.lib.format.open_memmap(filename, mode='w+', dtype=float, shape=shape)
+    
+    # innovations of the AR(1) noise with variance sigma^2, common part gives the cross-correlation
+    scale = sigma * np.sqrt(1 - phi**2)
+    zi = None
+    carry = np.zeros((gap - 1, stations), dtype=bool)
+    
+    for start in range(0, n, __chunk):
+        m = min(__chunk, n - start)
+        e = np.sqrt(rho) * rng.standard_normal((m, 1)) + np.sqrt(1 - rho) * rng.standard_normal((m, stations))
+        
+        if zi is None:
+            # stationary start
+            zi = phi * sigma * (np.sqrt(rho) * rng.standard_normal((1, 1)) + np.sqrt(1 - rho) * rng.standard_normal((1, stations)))
+        
+        e, zi = lfilter([scale], [1, -phi], e, axis=0, zi=zi)
+        
+        t = np.arange(start, start + m)[:, None]
+        chunk = slope * t + e
+        
+        if period is not None:
+            chunk = chunk + amplitude * np.sin(2 * np.pi * t / period)
+        
+        if censor is not None:
+            chunk = np.maximum(chunk, censor)
+        
+        if decimals is not None:
+            chunk = np.round(chunk, decimals)
+        
+        if nans > 0:
+            missing, carry = __gaps(rng, (m, stations), nans, gap, carry)
+            chunk[missing] = np.nan
+        
+        x[start:start + m] = chunk if stations > 1 else chunk[:, 0]
+    
+    if filename is not None:
+        x.flush()
+    
+    return x
+
+
+def generate_workload(name, seed = None, filename = None, **settings):
+    """
+    This function generates one of the WORKLOADS, whose settings can also be changed.
+    Input:
+        name: 'hamed_rao' (long autocorrelated series), 'seasonal' (daily data with a yearly cycle and long gaps), 'correlated_multivariate' (many cross-correlated stations) or 'censored' (stations with a detection limit)
+        seed: seed of the random data (default None)
+        filename: if given, data are written to this .npy file and returned as a memory-mapped array (default None)
+        settings: any input of generate, e.g. n
+    Output:
+        x: data of the workload
+    Examples
+    --------
+      >>> from pymannkendall.synthetic import generate_workload
+      >>> x = generate_workload('correlated_multivariate', seed = 1, stations = 200)
+    """
+    if name not in WORKLOADS:
+        raise ValueError('Unknown workload ' + repr(name) + ', it must be one of ' + ', '.join(sorted(WORKLOADS)) + '.')
+    
+    kwargs = dict(WORKLOADS[name])
+    kwargs.update(settings)
+    
+    return generate(seed = seed, filename = filename, **kwargs)
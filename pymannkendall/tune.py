@@ -0,0 +1,112 @@
+"""
+Calibrate the crossover lengths of the algorithm dispatch on this machine and store them in the local config file
+(PYMANNKENDALL_CONFIG or ~/.pymannkendall.json), which is read by pymannkendall on first use.
+Usage:
+    python -m pymannkendall.tune                 # calibrate and store
+    python -m pymannkendall.tune --dry-run       # only print the thresholds
+    python -m pymannkendall.tune --config path   # store in another file
+"""
+
+from __future__ import division, print_function
+import sys
+import json
+import time
+import platform
+import numpy as np
+from . import pymannkendall as core
+
+__core = vars(core)
+
+
+# best time of a call, repeated for at least min_time
+def __best_time(f, min_time = 0.05):
+    times = []
+    
+    while len(times) < 3 or sum(times) < min_time:
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    
+    return min(times)
+
+
+# data with some ties, as in most observed series
+def __data(n, seed = 0):
+    return np.round(np.random.RandomState(seed).randn(n), 2)
+
+
+# smallest n of sizes where fast(x) is faster than slow(x), or None if fast is never faster
+def __crossover(slow, fast, sizes):
+    for n in sizes:
+        x = __data(n)
+        
+        if __best_time(lambda: fast(x)) < __best_time(lambda: slow(x)):
+            return n
+    
+    return None
+
+
+def tune(verbose = True):
+    """
+    This function times the algorithms of every dispatched calculation for growing data length and returns the crossover thresholds.
+    Output:
+        thresholds: dictionary of {calculation: crossover length}, 'slope_selection' is a No. of pairwise slopes
+    """
+    sizes = [int(n) for n in np.unique(np.round(np.logspace(2, 4.5, 16)))]
+    thresholds = dict(__core['__default_thresholds'])
+    
+    # Mann-Kendal's score: vectorised loop or merge sort
+    n = __crossover(lambda x: __core['__mk_score_loop'](x, len(x)), lambda x: __core['__K'](x, np.arange(len(x))), sizes)
+    thresholds['mk_score'] = n if n is not None else sys.maxsize
+    
+    # autocorrelation: np.correlate or FFT
+    n = __crossover(__core['__acov_correlate'], __core['__acov_fft'], sizes)
+    thresholds['acf'] = n if n is not None else sys.maxsize
+    
+    # slope median: all pairwise slopes in memory or selection with the budget of production, 8n slopes in memory,
+    # the threshold is a No. of pairs
+    median = __core['__grouped_slope_median']
+    t = lambda x: [np.arange(len(x))]
+    memory = lambda x: median([x], t(x), budget = sys.maxsize)
+    selection = lambda x: median([x], t(x), budget = 8 * len(x))
+    
+    # all slopes in memory are only timed up to 2^24 pairs (128 MB)
+    slope_sizes = [n for n in sizes if n*(n-1)//2 <= 2**24]
+    
+    for n in slope_sizes[::4]:
+        x = __data(n)
+        
+        if memory(x) != selection(x):
+            raise AssertionError('Selected slope median differs from the median of all slopes for n = ' + str(n) + '.')
+    
+    n = __crossover(memory, selection, slope_sizes)
+    thresholds['slope_selection'] = n*(n-1)//2 if n is not None else sys.maxsize
+    
+    if verbose:
+        for k in sorted(thresholds):
+            print('%-20s %d' % (k, thresholds[k]))
+    
+    return thresholds
+
+
+def main(args):
+    thresholds = tune()
+    
+    if '--dry-run' in args:
+        return 0
+    
+    filename = args[args.index('--config') + 1] if '--config' in args else __core['__config_file']()
+    config = {'thresholds': thresholds, 'machine': platform.platform(), 'processor': platform.processor(), 'numpy': np.__version__}
+    
+    with open(filename, 'w') as f:
+        json.dump(config, f, indent=4, sort_keys=True)
+    
+    # the new thresholds are used from now on
+    __core['__thresholds'].clear()
+    print('Thresholds are stored in ' + filename)
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -25,10 +25,9 @@ setup(
     url = "https://github.com/mmhs013/pymannkendall",
     packages = ["pymannkendall"],
     license = __license__,
-    install_requires = ["numpy", "scipy"],
+    install_requires = ["numpy>=1.17", "scipy"],
+    python_requires = ">=3.5",
     classifiers = [
-		"Programming Language :: Python :: 2.7",
-		"Programming Language :: Python :: 3.4",
 		"Programming Language :: Python :: 3.5",
 		"Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
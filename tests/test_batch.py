@@ -0,0 +1,56 @@
+# In this unit test file, we check the batch test against the test of every series, with empty, constant and duplicate series.
+
+import pytest
+import numpy as np
+import pymannkendall as mk
+
+@pytest.fixture
+def grid_data():
+    # 60 cells of monthly data, where 5 cells are empty, 5 are constant (one with missing values) and 5 are duplicates
+    grid_data = np.random.RandomState(1).rand(120, 60).round(1)
+    grid_data[::9, 40:] = np.nan
+    grid_data[:, :5] = np.nan
+    grid_data[:, 5:10] = 2.5
+    grid_data[::7, 7] = np.nan
+    grid_data[:, 20:25] = grid_data[:, [45]]
+    return grid_data
+
+def test_batch_test_single_value(grid_data):
+    # a single value has no pair, so it is empty instead of a division by zero of the test
+    grid_data[1:, 10] = np.nan
+    results, empty, constant, duplicate = mk.batch_test(grid_data, mk.hamed_rao_modification_test)
+    assert empty == 6
+    assert results[10].trend == 'no trend'
+    assert results[10].slope != results[10].slope
+
+def test_batch_test(grid_data):
+    for test, kwargs in [(mk.original_test, {}), (mk.hamed_rao_modification_test, {'alpha': 0.1}), (mk.seasonal_test, {'period': 12}), (mk.sens_slope, {})]:
+        results, empty, constant, duplicate = mk.batch_test(grid_data, test, **kwargs)
+        
+        assert (empty, constant, duplicate) == (5, 5, 5)
+        
+        # results are those of every series, empty series have no trend without Tau, slope and intercept
+        for i in range(5, grid_data.shape[1]):
+            assert results[i] == test(grid_data[:,i], **kwargs)
+        
+        assert results[0].intercept != results[0].intercept
+        assert results[0].slope != results[0].slope
+        
+        if 'trend' in results[0]._fields:
+            assert results[0].trend == 'no trend'
+            assert results[0].p == 1
+
+def test_batch_test_calls(grid_data):
+    calls = []
+    
+    def counted(x, alpha = 0.05):
+        calls.append(1)
+        return mk.original_test(x, alpha)
+    
+    results, empty, constant, duplicate = mk.batch_test(grid_data, counted)
+    
+    # one call for constant and empty series and one for every other distinct series
+    assert len(calls) == 1 + 60 - 15
+    
+    with pytest.raises(ValueError):
+        mk.batch_test(grid_data, mk.pettitt_test)
@@ -0,0 +1,65 @@
+# In this unit test file, we check the field significance functions with small hand calculated examples and memory-mapped p-values.
+
+import pytest
+import numpy as np
+import pymannkendall as mk
+
+@pytest.fixture
+def p_values():
+    # 5 local tests and an empty cell
+    p_values = np.array([0.01, 0.04, 0.03, 0.005, 0.2, np.nan])
+    return p_values
+
+def test_fdr_test(p_values):
+    result = mk.fdr_test(p_values)
+    assert result.field_h == True
+    assert list(result.h) == [True, True, True, True, False, False]
+    assert result.p_threshold == 0.04
+    assert result.n_significant == 4
+    
+    result = mk.fdr_test(p_values, alpha=0.03)
+    assert list(result.h) == [True, False, False, True, False, False]
+    assert result.p_threshold == 0.01
+    
+    # no significant test
+    result = mk.fdr_test([0.5, 0.9])
+    assert result.field_h == False
+    assert result.n_significant == 0
+    assert not result.h.any()
+    
+    # a sequence of alpha gives the result of every rate
+    result = mk.fdr_test(p_values, alpha=[0.03, 0.05, 0.001])
+    assert list(result.field_h) == [True, True, False]
+    assert list(result.p_threshold) == [0.01, 0.04, 0.]
+    assert list(result.n_significant) == [2, 4, 0]
+    np.testing.assert_array_equal(result.h, np.stack([mk.fdr_test(p_values, a).h for a in [0.03, 0.05, 0.001]], axis=-1))
+    
+def test_walker_test(p_values):
+    result = mk.walker_test(p_values)
+    assert result.field_h == True
+    assert result.p_min == 0.005
+    np.testing.assert_allclose(result.p_threshold, 1 - 0.95**(1/5))
+    np.testing.assert_allclose(result.p, 1 - 0.995**5)
+    
+    result = mk.walker_test(p_values, alpha=0.01)
+    assert result.field_h == False
+    
+    result = mk.walker_test(p_values, alpha=[0.05, 0.01])
+    assert list(result.field_h) == [True, False]
+    np.testing.assert_allclose(result.p_threshold, [1 - 0.95**(1/5), 1 - 0.99**(1/5)])
+    assert result.p_min == 0.005
+    
+def test_field_significance_memmap(tmp_path):
+    p = 0.5 + np.random.RandomState(0).rand(100, 1000) / 2
+    p[0, :50] = 1e-8
+    
+    mm = np.memmap(str(tmp_path / 'p.dat'), dtype=float, mode='w+', shape=p.shape)
+    mm[:] = p
+    mm.flush()
+    
+    mm = np.memmap(str(tmp_path / 'p.dat'), dtype=float, mode='r', shape=p.shape)
+    result = mk.fdr_test(mm)
+    assert result.h.shape == (100, 1000)
+    assert result.n_significant == 50
+    assert result.h[0, :50].all()
+    assert mk.walker_test(mm).field_h == True
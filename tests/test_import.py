@@ -0,0 +1,31 @@
+# In this unit test file, we check that importing the package stays fast: scipy, git (version) and process pools are only loaded when they are used.
+
+import sys
+import subprocess
+
+def imported_modules(code):
+    out = subprocess.check_output([sys.executable, '-c', code + '; import sys; print(" ".join(sorted(sys.modules)))'])
+    return set(out.decode().split())
+
+def test_import_is_lazy():
+    modules = imported_modules('import pymannkendall')
+    assert not [m for m in modules if m == 'scipy' or m.startswith('scipy.')]
+    assert 'pymannkendall._version' not in modules
+    assert 'subprocess' not in modules
+    assert 'concurrent.futures' not in modules
+
+def test_lazy_version():
+    import pymannkendall as mk
+    from pymannkendall._version import get_versions
+    assert mk.__version__ == get_versions()['version']
+
+def test_version_before_python_37():
+    # module __getattr__ is not used before Python 3.7, so the version is resolved on import
+    code = 'import sys; sys.version_info = (3, 6); import pymannkendall as mk; print(vars(mk)["__version__"])'
+    out = subprocess.check_output([sys.executable, '-c', code]).decode().strip()
+    from pymannkendall._version import get_versions
+    assert out == get_versions()['version']
+
+def test_scipy_on_first_use():
+    modules = imported_modules('import pymannkendall as mk; mk.original_test([1, 2, 4, 3, 5])')
+    assert 'scipy.special' in modules
@@ -0,0 +1,63 @@
+# In this unit test file, we check the Pettitt change point test against its O(n^2) definition, for single series and batches of series.
+
+import pytest
+import numpy as np
+import pymannkendall as mk
+
+@pytest.fixture
+def shift_data():
+    # a shift of the median after 50 values
+    shift_data = np.r_[np.random.RandomState(1).rand(50), np.random.RandomState(2).rand(50) + 1]
+    return shift_data
+
+def pettitt_u(x):
+    return np.array([np.sum(np.sign(x[:t,None] - x[None,t:])) for t in range(1, len(x))])
+
+def test_pettitt_test(shift_data):
+    result = mk.pettitt_test(shift_data)
+    np.testing.assert_allclose(result.U, pettitt_u(shift_data))
+    assert result.h == True
+    assert result.cp == 50
+    assert result.K == 2500.0
+    np.testing.assert_allclose(result.p, 2 * np.exp(-6 * 2500.0**2 / (100**3 + 100**2)))
+    
+    # ties get the average rank
+    x = np.array([1., 2., 2., 1., 3., 3., 3., 2.])
+    np.testing.assert_allclose(mk.pettitt_test(x).U, pettitt_u(x))
+    
+    # no change point
+    result = mk.pettitt_test(np.ones(20))
+    assert result.h == False
+    assert result.K == 0.0
+    assert result.p == 1.0
+    
+    # a single value has no split point
+    result = mk.pettitt_test([3.0])
+    assert (result.h, result.cp, result.p, result.K) == (False, 0, 1.0, 0.0)
+    assert len(result.U) == 0
+    
+def test_pettitt_test_batch(shift_data):
+    x = np.stack([shift_data, shift_data[::-1], np.random.RandomState(3).rand(100)], axis=1)
+    x[[10, 70], 1] = np.nan
+    result = mk.pettitt_test(x)
+    assert result.U.shape == (99, 3)
+    
+    for i in range(3):
+        single = mk.pettitt_test(x[:,i])
+        assert result.h[i] == single.h
+        assert result.cp[i] == single.cp
+        assert result.p[i] == single.p
+        np.testing.assert_array_equal(result.U[:,i], single.U)
+    
+    # missing values are skipped, but the change point is an index of the original data
+    assert result.cp[1] == 50
+    valid = ~np.isnan(x[:,1])
+    np.testing.assert_allclose(result.U[valid[:-1],1], pettitt_u(x[valid,1]))
+    
+    # a sequence of alpha gives h of every column and level
+    alpha = [0.01, 0.05]
+    h = mk.pettitt_test(x, alpha).h
+    assert h.shape == (3, 2)
+    np.testing.assert_array_equal(h, result.p[:,None] < np.array(alpha))
+    assert mk.pettitt_test(x, [0.01, 0.05, 0.1, 0.2]).h.shape == (3, 4)
+    assert mk.pettitt_test(shift_data, alpha).h.shape == (2,)
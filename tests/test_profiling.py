@@ -0,0 +1,51 @@
+# In this unit test file, we check that profiling records every stage of the tests and leaves the package unchanged.
+
+import json
+import numpy as np
+import pymannkendall as mk
+from pymannkendall.profiling import profile, to_json
+
+def test_profile(tmpdir):
+    core = vars(mk.pymannkendall)
+    mk_score = core['__mk_score']
+    original_test = mk.original_test
+    x = np.random.RandomState(1).rand(100)
+    
+    with profile() as stats:
+        result = mk.original_test(x)
+        mk.original_test(x)
+        mk.pettitt_test(x)
+    
+    # same result and functions are restored
+    assert result == mk.original_test(x)
+    assert core['__mk_score'] is mk_score
+    assert mk.original_test is original_test
+    
+    assert stats['original_test']['calls'] == 2
+    assert stats['original_test']['elements'] == 200
+    assert stats['__mk_score']['calls'] == 2
+    assert stats['original_test']['stages']['__mk_score']['calls'] == 2
+    assert stats['original_test']['stages']['__sens_slope']['time'] <= stats['original_test']['time']
+    assert stats['pettitt_test']['stages']['__R']['calls'] == 1
+    assert 'stages' not in stats['__mk_score']
+    
+    # batch test is a test, whose stages are the tests of its series (5 series and 1 constant series for the empty one)
+    grid = np.random.RandomState(2).rand(50, 6)
+    grid[:, 0] = np.nan
+    with profile() as stats:
+        mk.batch_test(grid)
+        mk.batch_test(grid, mk.sens_slope)
+    assert stats['batch_test']['calls'] == 2
+    assert stats['batch_test']['stages']['original_test']['calls'] == 6
+    assert stats['batch_test']['stages']['sens_slope']['calls'] == 6
+    assert 'stages' not in stats['original_test']
+    
+    # selected stages only
+    with profile(['__variance_s']) as stats:
+        mk.original_test(x)
+    assert list(stats) == ['__variance_s']
+    
+    filename = str(tmpdir.join('profile.json'))
+    text = to_json(stats, filename)
+    with open(filename) as f:
+        assert json.load(f) == json.loads(text) == stats
@@ -82,6 +82,27 @@ def arbitrary_2d_data():
        [ 230., 2340.], [ 470.,  239.], [ 330., 1400.], [ 320., 3070.], [ 500.,  244.]])
     return arbitrary_2d_data
 
+def test_vectorised_p_value():
+    z_score = getattr(mk.pymannkendall, '__z_score')
+    p_value = getattr(mk.pymannkendall, '__p_value')
+    significance = getattr(mk.pymannkendall, '__significance')
+    
+    s = np.array([-1959., 0., 64620.])
+    var_s = np.array([4889800.333333333, 0., 5205500.])
+    z = z_score(s, var_s)
+    assert z[0] == -0.8854562842589916
+    assert z[1] == 0
+    
+    p, h, trend = significance(z, 0.05)
+    assert p[0] == 0.37591058740506833
+    assert p[1] == 1.0
+    assert list(h) == [False, False, True]
+    assert list(trend) == [0, 0, 1]
+    
+    p, h, trend = p_value(-3.8419950613710894, 0.05)
+    assert trend == 'decreasing'
+    assert h == True
+    
 def test_sens_slope(NoTrendData, TrendData, arbitrary_1d_data):
     # check with no trend data
     NoTrendRes = mk.sens_slope(NoTrendData)
@@ -96,6 +117,27 @@ def test_sens_slope(NoTrendData, TrendData, arbitrary_1d_data):
     assert result.slope == -0.006369426751592357
     assert result.intercept == 96.15286624203821
     
+def test_sens_slope_approximate(arbitrary_1d_data):
+    # short series need less pairs than sampling, so the slope is exact
+    exact = mk.sens_slope(arbitrary_1d_data)
+    result = mk.sens_slope(arbitrary_1d_data, method='approximate')
+    assert result[:2] == exact
+    assert result.lower == result.upper == exact.slope
+    assert result.rank_error == 0
+    
+    # sampled slope is within the rank error of the exact slope
+    x = np.random.RandomState(5).rand(3000) + np.arange(3000) * 1e-4
+    x[::40] = np.nan
+    exact = mk.sens_slope(x)
+    result = mk.sens_slope(x, method='approximate', tol=0.01, seed=3)
+    assert result == mk.sens_slope(x, method='approximate', tol=0.01, seed=3)
+    assert result.rank_error == 0.01
+    assert result.lower <= exact.slope <= result.upper
+    
+    d = np.sort(getattr(mk.pymannkendall, '__sens_estimator')(x))
+    d = d[~np.isnan(d)]
+    assert abs(np.searchsorted(d, result.slope) / len(d) - 0.5) <= 0.01
+    
 def test_seasonal_sens_slope(NoTrendData, TrendData, arbitrary_1d_data):
     # check with no trend data
     NoTrendRes = mk.seasonal_sens_slope(NoTrendData)
@@ -110,6 +152,59 @@ def test_seasonal_sens_slope(NoTrendData, TrendData, arbitrary_1d_data):
     assert result.slope == -0.08695652173913043
     assert result.intercept == 96.31159420289855
 
+def test_seasonal_sens_slope_selection():
+    # long series use the selection path, which must give the exact median of all seasonal slopes
+    x = np.random.RandomState(7).rand(2400)
+    x[::37] = np.nan
+    
+    d = []
+    for i in range(12):
+        col = x[i::12]
+        for j in range(len(col)):
+            d.append((col[j+1:] - col[j]) / np.arange(1, len(col) - j))
+            
+    slope = np.nanmedian(np.concatenate(d))
+    assert mk.seasonal_sens_slope(x, 12).slope == slope
+
+def test_slope_selection_ties():
+    # rounded data has large tie clusters of slopes, the selection must still give the exact median above the budget
+    grouped_slope_median = vars(mk.pymannkendall)['__grouped_slope_median']
+    x = (np.random.RandomState(4).randn(268, 2) * 10 + np.arange(268)[:, None] * 0.1).round()
+    
+    d = []
+    for k in range(x.shape[1]):
+        i, j = np.triu_indices(len(x), 1)
+        d.append((x[j,k] - x[i,k]) / (j - i))
+    
+    slope = np.median(np.concatenate(d))
+    t = [np.arange(len(x))] * 2
+    
+    for budget in [None, 64, 1024]:
+        assert grouped_slope_median([x[:,0], x[:,1]], t, budget) == slope
+
+def test_regional_sens_slope(arbitrary_2d_data):
+    assert mk.regional_sens_slope(arbitrary_2d_data).slope == mk.regional_test(arbitrary_2d_data).slope
+    
+    # many stations use the selection path, which must give the exact median of all station slopes
+    x = np.random.RandomState(3).rand(60, 400)
+    x[::7, ::3] = np.nan
+    
+    d = []
+    for k in range(x.shape[1]):
+        col = x[:,k]
+        for j in range(len(col)):
+            d.append((col[j+1:] - col[j]) / np.arange(1, len(col) - j))
+    
+    slope = np.nanmedian(np.concatenate(d))
+    assert mk.regional_sens_slope(x).slope == slope
+    
+    # rounded stations have tie clusters of slopes larger than the selection budget
+    x = (np.random.RandomState(6).randn(268, 2) * 10 + np.arange(268)[:, None] * 0.1).round()
+    i, j = np.triu_indices(len(x), 1)
+    
+    slope = np.median(((x[j] - x[i]) / (j - i)[:, None]).ravel())
+    assert mk.regional_sens_slope(x).slope == slope
+
 def test_original_test(NoTrendData, TrendData, arbitrary_1d_data):
     # check with no trend data
     NoTrendRes = mk.original_test(NoTrendData)
@@ -139,6 +234,20 @@ def test_original_test(NoTrendData, TrendData, arbitrary_1d_data):
     assert result.s == -1959.0
     assert result.var_s == 4889800.333333333
     
+def test_multiple_alpha(arbitrary_1d_data):
+    result = mk.seasonal_test(arbitrary_1d_data, period=12, alpha=[0.01, 0.05, 0.1])
+    assert result.trend == ('no trend', 'decreasing', 'decreasing')
+    assert list(result.h) == [False, True, True]
+    assert result.p == 0.03263834596177739
+    assert result.s == -399.0
+    
+    # hamed and rao variance depends on alpha through the significant lags
+    result = mk.hamed_rao_modification_test(arbitrary_1d_data, alpha=[0.05, 0.1], lag=3)
+    single = mk.hamed_rao_modification_test(arbitrary_1d_data, alpha=0.1, lag=3)
+    assert result.var_s[0] == 14228919.889368296
+    assert result.var_s[1] == single.var_s
+    assert result.trend[1] == single.trend
+    
 def test_hamed_rao_modification_test(NoTrendData, TrendData, arbitrary_1d_data):
     # check with no trend data
     NoTrendRes = mk.hamed_rao_modification_test(NoTrendData)
@@ -330,6 +439,72 @@ def test_seasonal_test(NoTrendData, TrendData, arbitrary_1d_data):
     assert result.s == -399.0
     assert result.var_s == 34702.333333333336
     
+def test_seasonal_test_seasons(arbitrary_1d_data):
+    # season labels and datetime give the same result as the regular period
+    result = mk.seasonal_test(arbitrary_1d_data, period=12)
+    
+    labels = np.arange(360) % 12
+    label_res = mk.seasonal_test(arbitrary_1d_data, period=12, seasons=labels)
+    assert label_res == result
+    
+    months = np.arange('2000-01', '2030-01', dtype='datetime64[M]')
+    date_res = mk.seasonal_test(arbitrary_1d_data, period=12, seasons=months)
+    assert date_res.s == result.s
+    assert date_res.var_s == result.var_s
+    assert date_res.slope == result.slope
+    
+    # missing months are the same as missing values
+    keep = np.ones(360, dtype=bool)
+    keep[[5, 17, 100]] = False
+    missing = arbitrary_1d_data.copy()
+    missing[~keep] = np.nan
+    
+    missing_res = mk.seasonal_test(missing, period=12)
+    date_res = mk.seasonal_test(arbitrary_1d_data[keep], period=12, seasons=months[keep])
+    assert date_res.s == missing_res.s == -437.0
+    assert date_res.var_s == missing_res.var_s == 33823.0
+    assert date_res.slope == missing_res.slope
+    
+    result = mk.correlated_seasonal_test(arbitrary_1d_data, period=12, seasons=months)
+    assert result.s == -333.0
+    assert result.var_s == 31427.666666666664
+    
+    # season labels of a cycle are their count, so the correlated test needs datetime seasons for missing records
+    with pytest.raises(ValueError):
+        mk.correlated_seasonal_test(arbitrary_1d_data[keep], period=12, seasons=labels[keep])
+    
+    # intercept has the time scale of the slope, (cycle, season) of every label
+    years = np.arange(360) / 12
+    keep = np.ones(360, dtype=bool)
+    keep[[353, 357]] = False
+    result = mk.seasonal_sens_slope(years[keep], period=12, seasons=labels[keep])
+    assert result.slope == 1.0
+    assert abs(result.intercept) < 1e-12
+    
+    # an empty season keeps the place of the others in the cycle
+    keep = labels != 3
+    result = mk.seasonal_sens_slope(years[keep], period=12, seasons=labels[keep])
+    assert result.slope == 1.0
+    assert abs(result.intercept) < 1e-12
+    
+    result = mk.seasonal_sens_slope(years[keep], period=12, seasons=months[keep])
+    assert result.slope == 1.0
+    assert abs(result.intercept) < 1e-12
+    
+def test_seasonal_test_weeks():
+    # ISO weeks, every week of a weekly series has its own (cycle, season) and week 53 is its own season
+    weeks = np.arange(np.datetime64('2000-01-03'), np.datetime64('2011-01-01'), 7)
+    x = np.random.RandomState(0).rand(len(weeks)) + np.arange(len(weeks)) / 520
+    
+    labels, cycles = vars(mk.pymannkendall)['__datetime_seasons'](weeks, 52)
+    assert len(set(zip(labels, cycles))) == len(weeks)
+    assert labels.max() == 52
+    assert np.sum(labels == 52) == 2  # 2004 and 2009 are long ISO years
+    
+    result = mk.correlated_seasonal_test(x, 52, seasons=weeks)
+    assert result.trend == 'increasing'
+    assert mk.seasonal_test(x, 52, seasons=weeks).trend == 'increasing'
+    
 def test_regional_test(NoTrend2dData,arbitrary_2d_data):
     # check with no trend data
     NoTrendRes = mk.regional_test(NoTrend2dData)
@@ -353,6 +528,67 @@ def test_regional_test(NoTrend2dData,arbitrary_2d_data):
     assert result.var_s == 103278.0
     assert result.slope == -0.680446465481604
     
+def test_regional_test_bootstrap(arbitrary_2d_data):
+    result = mk.regional_test(arbitrary_2d_data, method='bootstrap', n_boot=300, seed=7)
+    original = mk.regional_test(arbitrary_2d_data)
+    assert result[4:6] == original[4:6]
+    assert result.slope == original.slope
+    assert result.n_boot == 300
+    assert 0 <= result.p <= 1
+    assert result.h == (result.p < 0.05)
+    
+    # same seed gives the same resamples for any No. of processes
+    parallel = mk.regional_test(arbitrary_2d_data, method='bootstrap', n_boot=300, seed=7, n_jobs=2)
+    assert parallel.p == result.p
+    assert parallel.var_s == result.var_s
+    
+    # a common trend at every station is significant
+    x = np.arange(30.)[:,None] + np.zeros((30, 4))
+    result = mk.regional_test(x, method='bootstrap', n_boot=200, seed=0)
+    assert result.trend == 'increasing'
+    assert result.p == 0.0
+    
+def test_regional_seasonal_test(arbitrary_1d_data):
+    # a single station is the seasonal test
+    result = mk.regional_seasonal_test(arbitrary_1d_data.reshape(30, 12, 1))
+    assert result.trend == 'decreasing'
+    assert result.h == True
+    assert result.p == 0.03263834596177739
+    assert result.z == -2.136504114534638
+    assert result.Tau == -0.0794979079497908
+    assert result.s == -399.0
+    assert result.var_s == 34702.333333333336
+    assert result.slope == -0.08695652173913043
+    
+    # per block scores of two stations
+    x = np.stack([arbitrary_1d_data, np.arange(360.)], axis=1).reshape(30, 12, 2)
+    result, block = mk.regional_seasonal_test(x, blocks=True)
+    assert block.s.shape == (12, 2)
+    assert np.sum(block.s[:,0]) == -399.0
+    assert np.all(block.s[:,1] == 435.0)
+    assert result.s == -399.0 + 12 * 435.0
+    assert result.var_s == np.sum(block.var_s)
+    
+def test_homogeneity_test(arbitrary_1d_data):
+    # block scores from the seasonal test are reused
+    result, block = mk.seasonal_test(arbitrary_1d_data, period=12, blocks=True)
+    assert result.s == np.sum(block.s) == -399.0
+    
+    z = block.s / np.sqrt(block.var_s)
+    homog = mk.homogeneity_test(block)
+    np.testing.assert_allclose(homog.chi2_trend, 12 * np.mean(z)**2)
+    np.testing.assert_allclose(homog.chi2_homog, np.sum(z**2) - 12 * np.mean(z)**2)
+    assert homog == mk.homogeneity_test(arbitrary_1d_data.reshape(30, 12))
+    
+    # opposite trends at two stations are not homogeneous
+    x = np.stack([np.arange(360.), -np.arange(360.)], axis=1).reshape(30, 12, 2)
+    homog = mk.homogeneity_test(x)
+    assert homog.h == True
+    assert homog.chi2_trend == 0.0
+    assert homog.p_station < 0.05
+    np.testing.assert_allclose(homog.chi2_season, 0.0, atol=1e-9)
+    np.testing.assert_allclose(homog.chi2_homog, homog.chi2_season + homog.chi2_station + homog.chi2_interaction)
+    
 def test_correlated_multivariate_test(NoTrend2dData,arbitrary_2d_data):
     # check with no trend data
     NoTrendRes = mk.correlated_multivariate_test(NoTrend2dData)
@@ -421,4 +657,217 @@ def test_partial_test(NoTrend2dData,arbitrary_2d_data):
     assert result.s == -282.53012319329804
     assert result.var_s == 23740.695506142725
     assert result.slope == -0.5634920634920635
-    assert result.intercept == 471.9761904761905
\ No newline at end of file
+    assert result.intercept == 471.9761904761905
+    
+def test_partial_test_covariates(arbitrary_2d_data):
+    # a constant covariate does not change the partial test
+    result = mk.partial_test(arbitrary_2d_data)
+    x = np.column_stack([arbitrary_2d_data, np.ones(80)])
+    multi = mk.partial_test(x)
+    assert multi.trend == result.trend
+    np.testing.assert_allclose(multi.s, result.s)
+    np.testing.assert_allclose(multi.var_s, result.var_s)
+    
+    # several covariates
+    x = np.column_stack([arbitrary_2d_data, np.arange(80.), np.random.RandomState(1).rand(80)])
+    multi = mk.partial_test(x)
+    assert multi.Tau == result.Tau
+    assert multi.var_s < result.var_s
+    
+    with pytest.raises(ValueError):
+        mk.partial_test(arbitrary_2d_data[:,0])
+
+def test_sequential_test(arbitrary_1d_data):
+    x = arbitrary_1d_data[~np.isnan(arbitrary_1d_data)]
+    n = len(x)
+    
+    # progressive series from the O(n^2) definition of Sneyers (1990)
+    t = np.cumsum([np.sum(x[:i] < x[i]) for i in range(n)])
+    k = np.arange(1, n+1)
+    u = np.zeros(n)
+    u[1:] = (t[1:] - k[1:]*(k[1:]-1)/4) / np.sqrt(k[1:]*(k[1:]-1)*(2*k[1:]+5)/72)
+    
+    result = mk.sequential_test(arbitrary_1d_data)
+    np.testing.assert_allclose(result.u_prog, u)
+    np.testing.assert_allclose(result.u_retro, -mk.sequential_test(x[::-1]).u_prog[::-1])
+    
+    # change points are crossings of both series inside the confidence interval
+    d = result.u_prog - result.u_retro
+    for i in result.change_points:
+        assert np.any(np.diff(np.sign(d[max(i-1, 0):i+2])) != 0)
+        assert abs(result.u_prog[i]) < 1.96
+    
+    # change points of every level of a sequence of alpha
+    points = mk.sequential_test(arbitrary_1d_data, [0.01, 0.05, 0.1]).change_points
+    assert len(points) == 3
+    for p, a in zip(points, [0.01, 0.05, 0.1]):
+        np.testing.assert_array_equal(p, mk.sequential_test(arbitrary_1d_data, a).change_points)
+
+def test_trend_matrix(arbitrary_1d_data, tmpdir):
+    x = arbitrary_1d_data[:80]
+    result = mk.trend_matrix(x, min_length=10)
+    assert result.s.shape == (80, 80)
+    assert np.isnan(result.s[5, 13])
+    assert np.isnan(result.s[20, 10])
+    
+    # every window is the original test of that window
+    for (i, j) in [(0, 79), (3, 40), (50, 59), (12, 77)]:
+        window = mk.original_test(x[i:j+1])
+        assert result.s[i, j] == window.s
+        assert result.var_s[i, j] == window.var_s
+        np.testing.assert_allclose(result.z[i, j], window.z)
+        np.testing.assert_allclose(result.p[i, j], window.p)
+    
+    # memory-mapped result
+    filename = str(tmpdir.join('trend_matrix.npy'))
+    mapped = mk.trend_matrix(x, min_length=10, filename=filename)
+    np.testing.assert_array_equal(np.load(filename, mmap_mode='r')[0], result.s)
+    np.testing.assert_array_equal(mapped.var_s, result.var_s)
+
+def test_expanding_test(arbitrary_1d_data, tmpdir):
+    # every update is the original test of the whole history
+    filename = str(tmpdir.join('state.npz'))
+    
+    for (i, j) in [(0, 200), (200, 203), (203, 204), (204, 360)]:
+        result, state = mk.expanding_test(arbitrary_1d_data[i:j], filename, slope=True)
+        full = mk.original_test(arbitrary_1d_data[:j])
+        assert result[:9] == full
+        assert result.n == np.sum(~np.isnan(arbitrary_1d_data[:j]))
+    
+    # in memory state, without the slope
+    result, state = mk.expanding_test(arbitrary_1d_data[:300])
+    result, state = mk.expanding_test(arbitrary_1d_data[300:], state)
+    assert result.s == full.s
+    assert result.var_s == full.var_s
+    assert np.isnan(result.slope)
+    np.testing.assert_array_equal(state['sorted'], np.sort(arbitrary_1d_data[~np.isnan(arbitrary_1d_data)]))
+
+def test_algorithm_dispatch(arbitrary_1d_data, tmpdir, monkeypatch):
+    thresholds = vars(mk.pymannkendall)['__thresholds']
+    x = np.random.RandomState(2).rand(1500).round(2)
+    x[::50] = np.nan
+    
+    # FFT rounding of the lag-1 ACF flips near-tied pre-whitened values of these data
+    rng = np.random.RandomState(80)
+    rng.rand(400)
+    tied = (np.arange(400) * 0.05 + rng.randn(400)).round(1)
+    
+    # long rounded series have tie clusters of slopes larger than the selection budget
+    rounded = (np.random.RandomState(4).randn(600) * 10 + np.arange(600) * 0.1).round()
+    stations = (np.random.RandomState(4).randn(268, 2) * 10 + np.arange(268)[:, None] * 0.1).round()
+    
+    def results():
+        return mk.original_test(x), mk.hamed_rao_modification_test(x), mk.sens_slope(arbitrary_1d_data), mk.trend_free_pre_whitening_modification_test(tied), mk.pre_whitening_modification_test(tied), mk.multivariate_test(x.reshape(300, 5)), mk.homogeneity_test(x.reshape(300, 5)), mk.sens_slope(rounded), mk.regional_sens_slope(stations)
+    
+    # both algorithms of every calculation give the same results
+    saved = dict(mk.pymannkendall.__dict__['__default_thresholds'])
+    try:
+        thresholds.update(mk_score = 0, acf = 0, slope_selection = 0)
+        fast = results()
+        thresholds.update(mk_score = 10**9, acf = 10**9, slope_selection = 10**12)
+        slow = results()
+        thresholds.clear()
+        default = results()
+    finally:
+        thresholds.clear()
+    
+    assert fast[0] == slow[0]
+    assert fast[1][:2] == slow[1][:2]
+    np.testing.assert_allclose(fast[1][2:], slow[1][2:])
+    assert fast[2] == slow[2]
+    assert fast[3:] == slow[3:]
+    
+    assert default[7:] == slow[7:]
+    
+    i, j = np.triu_indices(len(rounded), 1)
+    assert fast[7].slope == default[7].slope == np.median((rounded[j] - rounded[i]) / (j - i))
+    
+    # thresholds of the local config file
+    filename = str(tmpdir.join('config.json'))
+    with open(filename, 'w') as f:
+        f.write('{"thresholds": {"acf": 123}}')
+    
+    monkeypatch.setenv('PYMANNKENDALL_CONFIG', filename)
+    assert mk.pymannkendall.__dict__['__threshold']('acf') == 123
+    assert mk.pymannkendall.__dict__['__threshold']('mk_score') == saved['mk_score']
+    thresholds.clear()
+
+
+
+def test_float32_data():
+    preprocessing = vars(mk.pymannkendall)['__preprocessing']
+    x64 = np.random.RandomState(3).rand(2000).round(3)
+    x64[::40] = np.nan
+    x32 = x64.astype(np.float32)
+    
+    # float64 arrays are not copied, float32 arrays stay float32
+    assert preprocessing(x64)[0] is x64
+    assert preprocessing(x32)[0].dtype == np.float32
+    assert preprocessing(x64.reshape(-1, 1))[0].base is x64
+    
+    # results are those of the float64 copy of the float32 data, except the intercept
+    for test in [mk.original_test, mk.hamed_rao_modification_test, mk.seasonal_test]:
+        a = test(x32)
+        b = test(x32.astype(float))
+        assert a[:-1] == b[:-1]
+        np.testing.assert_allclose(a.intercept, b.intercept, rtol=1e-6)
+    
+    X32 = np.random.RandomState(4).rand(300, 6).astype(np.float32)
+    assert mk.regional_test(X32)[:-1] == mk.regional_test(X32.astype(float))[:-1]
+    assert mk.sens_slope(x32).slope == mk.sens_slope(x32.astype(float)).slope
+    assert mk.sens_slope(x32, method='approximate', seed=1).slope == mk.sens_slope(x32.astype(float), method='approximate', seed=1).slope
+
+
+def test_zero_copy_input(arbitrary_1d_data, tmpdir):
+    import array
+    preprocessing = vars(mk.pymannkendall)['__preprocessing']
+    valid_values = vars(mk.pymannkendall)['__valid_values']
+    x = np.asarray(arbitrary_1d_data, dtype=float)
+    expected = mk.original_test(x)
+    
+    # buffer protocol, memmap and strided views are used without a copy
+    buffer = array.array('d', x)
+    assert np.shares_memory(preprocessing(buffer)[0], np.frombuffer(buffer))
+    assert mk.original_test(memoryview(buffer)) == expected
+    
+    m = np.lib.format.open_memmap(str(tmpdir.join('x.npy')), mode='w+', dtype=float, shape=(len(x), 2))
+    m[:,0] = x
+    assert np.shares_memory(preprocessing(m[:,0])[0], m)
+    assert mk.original_test(m[:,0]) == expected
+    
+    # data without missing values are not copied, the NaN mask gives the time of the valid values
+    clean = x[~np.isnan(x)]
+    assert valid_values(clean)[0] is clean
+    values, t = valid_values(x)
+    np.testing.assert_array_equal(t, np.flatnonzero(~np.isnan(x)))
+    np.testing.assert_array_equal(values, clean)
+
+
+def test_pandas_input(arbitrary_1d_data):
+    pd = pytest.importorskip('pandas')
+    preprocessing = vars(mk.pymannkendall)['__preprocessing']
+    x = np.asarray(arbitrary_1d_data, dtype=float)
+    
+    series = pd.Series(x)
+    assert np.shares_memory(preprocessing(series)[0], series.to_numpy())
+    
+    # missing values of nullable data are NaN
+    nullable = pd.Series(x, dtype='Float64')
+    assert mk.original_test(nullable) == mk.original_test(x)
+    assert mk.sens_slope(nullable) == mk.sens_slope(x)
+
+
+def test_assume_clean(arbitrary_1d_data, monkeypatch):
+    x = np.asarray(arbitrary_1d_data, dtype=float)
+    x = x[~np.isnan(x)]
+    
+    for test in [mk.original_test, mk.hamed_rao_modification_test, mk.yue_wang_modification_test, mk.pre_whitening_modification_test, mk.trend_free_pre_whitening_modification_test, mk.sens_slope]:
+        assert test(x, assume_clean=True) == test(x)
+        assert test(x[:20], assume_clean=True) == test(x[:20])
+    
+    assert mk.sens_slope(x, method='approximate', tol=0.05, seed=1, assume_clean=True) == mk.sens_slope(x, method='approximate', tol=0.05, seed=1)
+    
+    # short series compare all pairs at once, with the same result as the loop over rows
+    short = mk.original_test(x[:50]), mk.sens_slope(arbitrary_1d_data[:60])
+    monkeypatch.setitem(vars(mk.pymannkendall), '__max_pairs', 0)
+    assert (mk.original_test(x[:50]), mk.sens_slope(arbitrary_1d_data[:60])) == short
@@ -0,0 +1,45 @@
+# In this unit test file, we check that the synthetic data are reproducible and have the requested properties.
+
+import pytest
+import numpy as np
+import pymannkendall as mk
+from pymannkendall.synthetic import generate, generate_workload
+
+def test_generate():
+    x = generate(50000, phi=0.5, sigma=2., seed=1)
+    assert x.shape == (50000,)
+    assert np.array_equal(x, generate(50000, phi=0.5, sigma=2., seed=1))
+    assert abs(np.std(x) - 2.) < 0.1
+    assert abs(np.corrcoef(x[1:], x[:-1])[0, 1] - 0.5) < 0.05
+    
+    # trend and cycle
+    x = generate(1200, period=12, amplitude=5., slope=0.01, sigma=0.1, seed=1)
+    assert mk.seasonal_test(x, period=12).trend == 'increasing'
+    assert np.all(np.abs(x[3::12] - x[9::12] - 10.) < 1.)
+    
+    # ties and censored values
+    x = generate(1000, decimals=1, censor=-1., seed=2)
+    assert x.min() == -1.
+    assert np.array_equal(x, np.round(x, 1))
+    assert len(np.unique(x)) < 100
+
+def test_generate_stations(tmpdir):
+    x = generate(100000, stations=3, rho=0.4, nans=0.1, gap=20, seed=3)
+    assert x.shape == (100000, 3)
+    assert abs(np.mean(np.isnan(x)) - 0.1) < 0.02
+    
+    corr = np.ma.corrcoef(np.ma.masked_invalid(x).T)
+    assert np.all(np.abs(corr[np.triu_indices(3, 1)] - 0.4) < 0.05)
+    
+    # memory-mapped data are the same as in memory, across chunks
+    filename = str(tmpdir.join('stations.npy'))
+    mapped = generate(100000, stations=3, rho=0.4, nans=0.1, gap=20, seed=3, filename=filename)
+    assert isinstance(mapped, np.memmap)
+    np.testing.assert_array_equal(np.load(filename, mmap_mode='r'), x)
+
+def test_generate_workload():
+    x = generate_workload('correlated_multivariate', seed=4, n=500, stations=5)
+    assert x.shape == (500, 5)
+    
+    with pytest.raises(ValueError):
+        generate_workload('unknown')